@@ -1,144 +1,119 @@
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.const import Platform
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-import async_timeout
 import logging
-from datetime import timedelta
 from .mr200 import MR200Client
-from .const import DOMAIN, DEFAULT_USERNAME
-
-PLATFORMS = [Platform.SENSOR, Platform.BUTTON, Platform.SWITCH]
+from .session import MR200Session
+from .coordinator import MR200Coordinator, STORAGE_VERSION
+from .usage import UsageCounter
+from .throughput import ThroughputSampler
+from .fleet import async_get_scheduler
+from .exporter import async_get_exporter
+from .outbox import SmsOutbox
+from .const import (
+    DOMAIN,
+    DEFAULT_USERNAME,
+    CONF_FAST_SAMPLE,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SMS_INTERVAL,
+    CONF_SMS_RETRIES,
+    SAMPLE_INTERVAL,
+    SMS_INTERVAL,
+    SMS_RETRIES,
+)
+
+PLATFORMS = [Platform.SENSOR, Platform.BUTTON, Platform.SWITCH, Platform.DEVICE_TRACKER]
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_SEND_SMS = "send_sms"
 
 SERVICE_SEND_SMS_SCHEMA = vol.Schema({
     vol.Required("device"): cv.string,
-    vol.Required("number"): cv.string,
+    vol.Required("number"): vol.All(cv.ensure_list_csv, [cv.string]),
     vol.Required("text"): cv.string,
 })
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    client = MR200Client(entry.data["host"])
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN].setdefault(f"{entry.entry_id}_fetch_enabled", True)
-    
-    async def async_update_data():
+    client = MR200Client(entry.data["host"], async_get_clientsession(hass))
+    session = MR200Session(
+        client,
+        entry.data.get("username", DEFAULT_USERNAME),
+        entry.data["password"],
+    )
+
+    async def async_logout():
         try:
-            if not hass.data[DOMAIN].get(f"{entry.entry_id}_fetch_enabled", True):
-                return coordinator.data if hasattr(coordinator, 'data') and coordinator.data else {}
-            
-            async with async_timeout.timeout(10):
-                username = entry.data.get("username", DEFAULT_USERNAME)
-                password = entry.data["password"]
-                
-                await hass.async_add_executor_job(client.login, username, password)
-                data = {}
-                
-                lte_link = await hass.async_add_executor_job(client.get_wan_lte_link_cfg)
-                lte_intf = await hass.async_add_executor_job(client.get_wan_lte_intf_cfg)
-                lte_wan = await hass.async_add_executor_job(client.get_lte_wan_cfg)
-                wan_common = await hass.async_add_executor_job(client.get_wan_common_intf_cfg)
-                clients = await hass.async_add_executor_job(client.get_clients)
-                sms = await hass.async_add_executor_job(client.get_sms)
-                device_info = await hass.async_add_executor_job(client.get_device_info)
-                wan_ip_conn = await hass.async_add_executor_job(client.get_wan_ip_connection)
-
-                data["device_info"] = {
-                    "manufacturer": device_info.get("manufacturer", ""),
-                    "model": device_info.get("modelName", ""),
-                    "hw_version": device_info.get("hardwareVersion", ""),
-                    "sw_version": device_info.get("softwareVersion", ""),
-                    "device_url": f"http://{entry.data['host']}",
-                    "mac_address": wan_ip_conn.get("MACAddress", ""),
-                }
-
-                if lte_link and len(lte_link) > 0:
-                    link_data = lte_link[0]
-                    signal = link_data.get("signalStrength", "0")
-                    signal_map = {"1": 25, "2": 50, "3": 75, "4": 100}
-                    data["lte_signal_level"] = signal_map.get(signal, 0)
-                    data["lte_enabled"] = link_data.get("enable", "0")
-                    network_types = {
-                        "0": "No Service",
-                        "1": "GSM",
-                        "2": "WCDMA",
-                        "3": "4G LTE",
-                        "4": "TD-SCDMA",
-                        "5": "CDMA 1x",
-                        "6": "CDMA 1x Ev-Do",
-                        "7": "4G+ LTE"
-                    }
-                    data["lte_network_type"] = link_data.get("networkType", "0")
-                    data["lte_network_type_info"] = network_types.get(link_data.get("networkType"), "Unknown")
-                    sim_status = {
-                        "0": "No SIM card detected or SIM card error.",
-                        "1": "No SIM card detected.",
-                        "2": "SIM card error.",
-                        "3": "SIM card prepared.",
-                        "4": "SIM locked.",
-                        "5": "SIM unlocked. Authentication succeeded.",
-                        "6": "PIN locked.",
-                        "7": "SIM card is locked permanently.",
-                        "8": "suspension of transmission",
-                        "9": "Unopened"
-                    }
-                    data["lte_sim_status"] = link_data.get("simStatus", "0")
-                    data["lte_sim_status_info"] = sim_status.get(link_data.get("simStatus"), "Unknown")
-                    data["lte_connect_status"] = link_data.get("connectStatus", "0")
-                if lte_intf:
-                    data["lte_current_rx_speed"] = int(lte_intf.get("curRxSpeed", "0"))
-                    data["lte_current_tx_speed"] = int(lte_intf.get("curTxSpeed", "0"))
-                    data["lte_total_statistics"] = float(lte_intf.get("totalStatistics", "0"))
-                data["lte_isp_name"] = lte_wan.get("profileName", "Unknown")
-                data["connection_type"] = wan_common.get("WANAccessType", "Unknown")
-                data["total_clients"] = len(clients) if clients else 0
-                data["unread_sms"] = sum(1 for msg in sms if msg.get("unread") == "1") if sms else 0
-                await hass.async_add_executor_job(client.logout)
-                return data
+            await session.async_logout()
         except Exception as err:
-            _LOGGER.error("Error updating data: %s", err)
-            raise
+            _LOGGER.warning("Error during logout: %s", err)
 
-    coordinator = DataUpdateCoordinator(
-        hass,
-        logger=_LOGGER,
-        name="TP-Link MR200",
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=30)
-    )
-
-    await coordinator.async_config_entry_first_refresh()
+    # Unload callbacks run in reverse, so logging out last leaves no poller to log in again
+    entry.async_on_unload(async_logout)
 
-    device_registry = dr.async_get(hass)
-    device_info = coordinator.data.get("device_info", {})
-    mac = device_info.get("mac_address", "")
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN].setdefault(f"{entry.entry_id}_fetch_enabled", True)
     
-    if mac:
-        device_registry.async_get_or_create(
+    coordinator = MR200Coordinator(hass, entry, session)
+    # Flushed after the pollers below stop, so async_remove_entry deletes the final files
+    entry.async_on_unload(coordinator.async_flush)
+    entry.async_on_unload(coordinator.health.async_stop)
+    scheduler = async_get_scheduler(hass)
+    await coordinator.usage.async_load()
+    entry.async_on_unload(coordinator.usage.async_flush)
+    coordinator.usage.async_start()
+    entry.async_on_unload(coordinator.usage.async_stop)
+
+    restored = await coordinator.async_restore()
+    if not restored:
+        async with scheduler.semaphore:
+            await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(scheduler.async_register(coordinator))
+    if restored:
+        scheduler.async_request_poll(coordinator)
+
+    if coordinator.data.device_info.mac_address:
+        dr.async_get(hass).async_get_or_create(
             config_entry_id=entry.entry_id,
-            identifiers={(DOMAIN, mac)},
-            connections={(dr.CONNECTION_NETWORK_MAC, mac)},
-            name="TP-Link MR200",
-            manufacturer=device_info.get("manufacturer", "TP-Link"),
-            model=device_info.get("model", "MR200"),
-            hw_version=device_info.get("hw_version"),
-            sw_version=device_info.get("sw_version"),
-            configuration_url=device_info.get("device_url"),
+            **coordinator.device.info,
+        )
+
+    sampler = None
+    if entry.options.get(CONF_FAST_SAMPLE, False):
+        sampler = ThroughputSampler(
+            hass,
+            session,
+            entry.options.get(CONF_SAMPLE_INTERVAL, SAMPLE_INTERVAL),
+            lambda: coordinator.health.available and hass.data[DOMAIN].get(f"{entry.entry_id}_fetch_enabled", True),
         )
+        sampler.async_start()
+        entry.async_on_unload(sampler.async_stop)
+
+    outbox = SmsOutbox(
+        hass,
+        session,
+        entry.options.get(CONF_SMS_INTERVAL, SMS_INTERVAL),
+        entry.options.get(CONF_SMS_RETRIES, SMS_RETRIES),
+    )
+    outbox.async_start()
+    entry.async_on_unload(outbox.async_stop)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "client": client,
+        "session": session,
         "coordinator": coordinator,
+        "sampler": sampler,
+        "outbox": outbox,
     }
 
     async def async_send_sms(call: ServiceCall) -> None:
         device_id = call.data.get("device")
-        number = call.data.get("number")
+        numbers = call.data.get("number")
         text = call.data.get("text")
 
         device_registry = dr.async_get(hass)
@@ -158,16 +133,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             _LOGGER.error("No config entry found for device: %s", device_id)
             return
 
-        target_client = hass.data[DOMAIN][target_entry]["client"]
+        outbox = hass.data[DOMAIN][target_entry]["outbox"]
         
         try:
-            username = hass.config_entries.async_get_entry(target_entry).data.get("username", DEFAULT_USERNAME)
-            password = hass.config_entries.async_get_entry(target_entry).data["password"]
-            
-            await hass.async_add_executor_job(target_client.login, username, password)
-            await hass.async_add_executor_job(target_client.send_sms, number, text)
-            await hass.async_add_executor_job(target_client.logout)
-            
+            await outbox.async_send(numbers, text)
         except Exception as err:
             _LOGGER.error("Error sending SMS: %s", err)
             raise
@@ -179,16 +148,33 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         schema=SERVICE_SEND_SMS_SCHEMA,
     )
 
+    exporter = async_get_exporter(hass)
+    exporter.async_update(coordinator)
+    entry.async_on_unload(coordinator.async_add_listener(lambda: exporter.async_update(coordinator)))
+    entry.async_on_unload(lambda: exporter.async_remove(entry.entry_id))
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.async_update_plan()
+
+    @callback
+    def async_entity_registry_updated(event) -> None:
+        if event.data["action"] != "update" or "disabled_by" not in event.data.get("changes", {}):
+            return
+        entity = er.async_get(hass).async_get(event.data["entity_id"])
+        if entity and entity.config_entry_id == entry.entry_id:
+            coordinator.async_update_plan()
+
+    entry.async_on_unload(
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, async_entity_registry_updated)
+    )
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    try:
-        client = hass.data[DOMAIN][entry.entry_id]["client"]
-        await hass.async_add_executor_job(client.logout)
-    except Exception as err:
-        _LOGGER.warning("Error during logout: %s", err)
-    
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
@@ -196,4 +182,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if not hass.data[DOMAIN]:
             hass.services.async_remove(DOMAIN, SERVICE_SEND_SMS)
     
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await UsageCounter(hass, entry.entry_id).async_remove()
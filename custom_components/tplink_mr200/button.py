@@ -1,49 +1,56 @@
+import logging
+
+import aiohttp
 from homeassistant.components.button import ButtonEntity, ButtonDeviceClass, ButtonEntityDescription
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.const import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers import device_registry as dr
 from .const import DOMAIN
+from .mr200 import NotLoggedInException
+from .session import UNSENT_ERRORS
+
+_LOGGER = logging.getLogger(__name__)
+
+REBOOT = ButtonEntityDescription(
+    key="reboot",
+    name="Reboot",
+    icon="mdi:restart",
+    device_class=ButtonDeviceClass.RESTART,
+    entity_category=EntityCategory.CONFIG,
+)
 
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    client = hass.data[DOMAIN][config_entry.entry_id]["client"]
+    session = hass.data[DOMAIN][config_entry.entry_id]["session"]
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
-    async_add_entities([RebootButton(coordinator, client)])
+    async_add_entities([RebootButton(coordinator, session, REBOOT)])
 
 class RebootButton(ButtonEntity):
-    def __init__(self, coordinator, client):
-        device_info = coordinator.data.get("device_info", {})
-        device_name0 = device_info.get("manufacturer", "").lower().replace(" ", "_").replace("-", "_")
-        device_name1 = device_info.get("model", "").lower().replace("archer","").replace(" ", "_")
-        device_name = device_name0 + "_" + device_name1
-        self._client = client
+    def __init__(self, coordinator, session, description: ButtonEntityDescription):
+        slug = coordinator.device.slug
+        self.entity_description = description
+        self._session = session
         self._coordinator = coordinator
-        self._attr_device_class = ButtonDeviceClass.RESTART
-        self._attr_entity_category = EntityCategory.CONFIG
-        self._attr_name = "Reboot"
-        self.entity_id = f"button.{device_name}_reboot"
-        self._attr_unique_id = f"{device_name}_reboot"
-        self._attr_icon = "mdi:restart"
+        self.entity_id = f"button.{slug}_{description.key}"
+        self._attr_unique_id = f"{slug}_{description.key}"
 
     @property
     def device_info(self):
-        device_info = self._coordinator.data.get("device_info", {})
-        mac = device_info.get("mac_address")
-        return {
-            "identifiers": {(DOMAIN, mac)},
-            "connections": {(dr.CONNECTION_NETWORK_MAC, mac)},
-            "name": "TP-Link MR200",
-            "manufacturer": device_info.get("manufacturer"),
-            "model": device_info.get("model"),
-            "hw_version": device_info.get("hw_version"),
-            "sw_version": device_info.get("sw_version"),
-            "configuration_url": device_info.get("device_url", "https://example.com")
-        }
+        return self._coordinator.device.info
 
     async def async_press(self) -> None:
-        await self.hass.async_add_executor_job(self._client.reboot)
\ No newline at end of file
+        try:
+            await self._session.async_call(self._session.client.reboot, retry=False)
+        except UNSENT_ERRORS as err:
+            raise HomeAssistantError(f"Could not send the reboot request to the router: {err!r}") from err
+        except (aiohttp.ClientError, TimeoutError, NotLoggedInException) as err:
+            # The router often drops the connection as it goes down, so the reboot has likely started
+            _LOGGER.debug("No reply to the reboot request, assuming the router is rebooting: %r", err)
+            self._coordinator.health.async_mark_rebooting()
+            return
+        self._coordinator.health.async_mark_rebooting()
@@ -0,0 +1,28 @@
+from collections import namedtuple
+
+ClientDiff = namedtuple("ClientDiff", ["joined", "left", "changed"])
+
+EMPTY_DIFF = ClientDiff(frozenset(), frozenset(), frozenset())
+
+class ClientIndex:
+    def __init__(self):
+        self.clients = {}
+        self.previous = {}
+
+    def update(self, entries):
+        current = {}
+        for entry in entries:
+            mac = entry.get("MACAddress", "").upper()
+            if mac:
+                current[mac] = (entry.get("IPAddress", ""), entry.get("hostName", ""))
+
+        previous = self.clients
+        joined = current.keys() - previous.keys()
+        left = previous.keys() - current.keys()
+        changed = {
+            mac for mac in current.keys() & previous.keys()
+            if current[mac] != previous[mac]
+        }
+        self.previous = previous
+        self.clients = current
+        return ClientDiff(frozenset(joined), frozenset(left), frozenset(changed))
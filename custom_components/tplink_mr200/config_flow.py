@@ -1,7 +1,35 @@
 from homeassistant import config_entries
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import voluptuous as vol
 
-from .const import DOMAIN, DEFAULT_HOST, DEFAULT_USERNAME, CONF_HOST, CONF_PASSWORD
+from .const import (
+    DOMAIN,
+    DEFAULT_HOST,
+    DEFAULT_USERNAME,
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_FAST_INTERVAL,
+    CONF_UPDATE_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    CONF_FAST_SAMPLE,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SMS_INTERVAL,
+    CONF_SMS_RETRIES,
+    CONF_BILLING_DAY,
+    CONF_DEADBAND,
+    CONF_DEADBAND_RELATIVE,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_MAX_WRITE_AGE,
+    FILTERED_SENSORS,
+    FAST_INTERVAL,
+    UPDATE_INTERVAL,
+    SLOW_INTERVAL,
+    SAMPLE_INTERVAL,
+    SMS_INTERVAL,
+    SMS_RETRIES,
+    BILLING_DAY,
+)
 from .mr200 import MR200Client, ConnectionFailedException, LoginFailedException
 
 class MR200ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -12,13 +40,9 @@ class MR200ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             try:
-                client = MR200Client(user_input[CONF_HOST])
-                await self.hass.async_add_executor_job(
-                    client.login,
-                    DEFAULT_USERNAME,
-                    user_input[CONF_PASSWORD]
-                )
-                await self.hass.async_add_executor_job(client.logout)
+                client = MR200Client(user_input[CONF_HOST], async_get_clientsession(self.hass))
+                await client.login(DEFAULT_USERNAME, user_input[CONF_PASSWORD])
+                await client.logout()
 
                 return self.async_create_entry(
                     title=f"TP-Link MR200 ({user_input[CONF_HOST]})",
@@ -37,3 +61,47 @@ class MR200ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }),
             errors=errors,
         )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return MR200OptionsFlow()
+
+class MR200OptionsFlow(config_entries.OptionsFlow):
+    def __init__(self):
+        self._options = {}
+
+    async def async_step_init(self, user_input=None):
+        if user_input is not None:
+            self._options.update(user_input)
+            return await self.async_step_filters()
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Required(CONF_FAST_INTERVAL, default=options.get(CONF_FAST_INTERVAL, FAST_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Required(CONF_UPDATE_INTERVAL, default=options.get(CONF_UPDATE_INTERVAL, UPDATE_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Required(CONF_SLOW_INTERVAL, default=options.get(CONF_SLOW_INTERVAL, SLOW_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                vol.Required(CONF_FAST_SAMPLE, default=options.get(CONF_FAST_SAMPLE, False)): bool,
+                vol.Required(CONF_SAMPLE_INTERVAL, default=options.get(CONF_SAMPLE_INTERVAL, SAMPLE_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(CONF_SMS_INTERVAL, default=options.get(CONF_SMS_INTERVAL, SMS_INTERVAL)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(CONF_SMS_RETRIES, default=options.get(CONF_SMS_RETRIES, SMS_RETRIES)): vol.All(vol.Coerce(int), vol.Range(min=0, max=5)),
+                vol.Required(CONF_BILLING_DAY, default=options.get(CONF_BILLING_DAY, BILLING_DAY)): vol.All(vol.Coerce(int), vol.Range(min=1, max=31)),
+            }),
+        )
+
+    async def async_step_filters(self, user_input=None):
+        if user_input is not None:
+            return self.async_create_entry(data={**self._options, **user_input})
+
+        options = self.config_entry.options
+        schema = {}
+        for key in FILTERED_SENSORS:
+            schema.update({
+                vol.Required(f"{key}_{CONF_DEADBAND}", default=options.get(f"{key}_{CONF_DEADBAND}", 0)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(f"{key}_{CONF_DEADBAND_RELATIVE}", default=options.get(f"{key}_{CONF_DEADBAND_RELATIVE}", False)): bool,
+                vol.Required(f"{key}_{CONF_MIN_WRITE_INTERVAL}", default=options.get(f"{key}_{CONF_MIN_WRITE_INTERVAL}", 0)): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(f"{key}_{CONF_MAX_WRITE_AGE}", default=options.get(f"{key}_{CONF_MAX_WRITE_AGE}", 0)): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            })
+        return self.async_show_form(step_id="filters", data_schema=vol.Schema(schema))
@@ -1,9 +1,41 @@
 DOMAIN = "tplink_mr200"
 
+EVENT_SMS_RECEIVED = f"{DOMAIN}_sms_received"
+EVENT_WAN_CHANGED = f"{DOMAIN}_wan_changed"
+EVENT_NETWORK_TYPE_CHANGED = f"{DOMAIN}_network_type_changed"
+EVENT_SIM_STATUS_CHANGED = f"{DOMAIN}_sim_status_changed"
+EVENT_CLIENT_JOINED = f"{DOMAIN}_client_joined"
+EVENT_CLIENT_LEFT = f"{DOMAIN}_client_left"
+EVENT_UNREAD_SMS_CHANGED = f"{DOMAIN}_unread_sms_changed"
+
 DEFAULT_HOST = "192.168.3.1"
 DEFAULT_USERNAME = "admin"
 
 CONF_HOST = "host"
 CONF_PASSWORD = "password"
 
+CONF_FAST_INTERVAL = "fast_interval"
+CONF_UPDATE_INTERVAL = "update_interval"
+CONF_SLOW_INTERVAL = "slow_interval"
+CONF_FAST_SAMPLE = "fast_sample"
+CONF_SAMPLE_INTERVAL = "sample_interval"
+CONF_SMS_INTERVAL = "sms_interval"
+CONF_SMS_RETRIES = "sms_retries"
+CONF_BILLING_DAY = "billing_day"
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_RELATIVE = "deadband_relative"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_MAX_WRITE_AGE = "max_write_age"
+
+FAST_INTERVAL = 10
 UPDATE_INTERVAL = 30
+SLOW_INTERVAL = 3600
+
+SAMPLE_INTERVAL = 1
+SMS_INTERVAL = 1
+SMS_RETRIES = 2
+BILLING_DAY = 1
+
+FILTERED_SENSORS = ("lte_current_rx_speed", "lte_current_tx_speed", "lte_signal_level")
+
+MAX_CONCURRENT_POLLS = 8
@@ -0,0 +1,302 @@
+import asyncio
+import logging
+import time
+
+import aiohttp
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    DOMAIN,
+    CONF_FAST_INTERVAL,
+    CONF_UPDATE_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    CONF_BILLING_DAY,
+    FAST_INTERVAL,
+    UPDATE_INTERVAL,
+    SLOW_INTERVAL,
+    BILLING_DAY,
+)
+from .sections import SECTIONS, CONSUMERS, build_plan
+from .session import MR200Session
+from .mr200 import ConnectionFailedException, LoginFailedException
+from .sms import SmsInbox
+from .clients import ClientIndex, EMPTY_DIFF
+from .health import RouterHealth
+from .events import StateEvents, async_event_consumers
+from .device import build_device
+from .fleet import async_get_scheduler
+from .usage import UsageCounter
+from .data import (
+    MR200Data,
+    MR200DeviceInfo,
+    SIGNAL_LEVELS,
+    NETWORK_TYPES,
+    SIM_STATUSES,
+    changed_fields,
+    snapshot_to_dict,
+    snapshot_from_dict,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+POLL_TIMEOUT = 10
+
+UNREACHABLE_ERRORS = (ConnectionFailedException, aiohttp.ClientError, TimeoutError)
+
+ALWAYS_CONSUMERS = ("device_info", "sms_events", "usage")
+DEFAULT_CONSUMERS = ("client_trackers",)
+
+DEFAULT_INTERVALS = {
+    CONF_FAST_INTERVAL: FAST_INTERVAL,
+    CONF_UPDATE_INTERVAL: UPDATE_INTERVAL,
+    CONF_SLOW_INTERVAL: SLOW_INTERVAL,
+}
+
+def _number(value, kind):
+    return kind(value or 0) if value is not None else None
+
+class MR200Coordinator(DataUpdateCoordinator):
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, session: MR200Session):
+        self.entry = entry
+        self.session = session
+        self.intervals = {
+            tier: entry.options.get(tier, default)
+            for tier, default in DEFAULT_INTERVALS.items()
+        }
+        self.updated_sections = set()
+        self.changed = frozenset()
+        self._raw = {}
+        self._fetched_at = {}
+        self.plan = build_plan(CONSUMERS)
+        self._consumers = {}
+        self._event_consumers = None
+        self._tick = min(self.intervals.values())
+        self.sms_inbox = SmsInbox(hass, entry.entry_id, entry.data["host"])
+        self.client_index = ClientIndex()
+        self.client_diff = EMPTY_DIFF
+        self._clients_known = False
+        self.device = build_device(MR200DeviceInfo())
+        self.events = StateEvents(hass, entry.entry_id, entry.data["host"])
+        self.usage = UsageCounter(hass, entry.entry_id, entry.options.get(CONF_BILLING_DAY, BILLING_DAY))
+        self.health = RouterHealth(hass, session.client, self._async_recovered)
+        self.store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+        self.scheduler = async_get_scheduler(hass)
+        self._poll_lock = asyncio.Lock()
+        super().__init__(
+            hass,
+            logger=_LOGGER,
+            name="TP-Link MR200",
+            update_interval=None,
+        )
+
+    @property
+    def tick(self):
+        return self._tick
+
+    def fetched_at(self, name):
+        return self._fetched_at.get(name)
+
+    @callback
+    def async_refresh_sections(self, *names):
+        for name in names:
+            self._fetched_at.pop(name, None)
+        self.scheduler.async_request_poll(self)
+
+    @callback
+    def async_register_consumer(self, domain, unique_id, consumer):
+        if consumer in CONSUMERS:
+            self._consumers[unique_id] = (domain, consumer)
+
+    @callback
+    def async_update_plan(self):
+        registry = er.async_get(self.hass)
+        enabled = set(ALWAYS_CONSUMERS)
+        registered = set()
+        for unique_id, (domain, consumer) in self._consumers.items():
+            registered.add(consumer)
+            entity_id = registry.async_get_entity_id(domain, DOMAIN, unique_id)
+            entity = registry.async_get(entity_id) if entity_id else None
+            if entity is None or entity.disabled_by is None:
+                enabled.add(consumer)
+        enabled.update(consumer for consumer in DEFAULT_CONSUMERS if consumer not in registered)
+        self._event_consumers = async_event_consumers(self.hass)
+        enabled.update(self._event_consumers)
+        self.plan = build_plan(enabled)
+        for name in self._raw.keys() - self.plan.keys():
+            del self._raw[name]
+            self._fetched_at.pop(name, None)
+        _LOGGER.debug("Fetch plan for %s: %s", self.entry.title, ", ".join(self.plan))
+
+    async def async_restore(self):
+        stored = await self.store.async_load()
+        if not stored or "data" not in stored:
+            return False
+        try:
+            self.data = snapshot_from_dict(stored["data"])
+        except (TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring stored state for %s: %s", self.entry.title, err)
+            return False
+        self.client_index.clients = {
+            mac: tuple(client) for mac, client in stored.get("clients", {}).items()
+        }
+        self._clients_known = "clients" in stored
+        self.sms_inbox.restore(stored.get("sms", {}))
+        self.changed = changed_fields(None, self.data)
+        self.device = build_device(self.data.device_info)
+        return True
+
+    async def async_flush(self):
+        # Writes any delayed save now, so nothing is written back after the entry is removed
+        if self.data is not None:
+            await self.store.async_save(self._stored_state())
+
+    @callback
+    def _stored_state(self):
+        return {
+            "data": snapshot_to_dict(self.data),
+            "clients": self.client_index.clients,
+            "sms": self.sms_inbox.as_dict(),
+        }
+
+    async def _async_recovered(self):
+        self.async_refresh_sections(*self.plan)
+
+    def _due_sections(self):
+        now = time.monotonic()
+        return [
+            name
+            for name in self.plan
+            if name not in self._fetched_at
+            or now - self._fetched_at[name] >= self.intervals[SECTIONS[name].tier] - self._tick / 2
+        ]
+
+    async def _async_update_data(self):
+        # Scheduled ticks, on-demand polls and entity refreshes may overlap; run their polls one at a time
+        async with self._poll_lock:
+            with self.session.client.metrics.measure("poll"):
+                return await self._async_poll()
+
+    async def _async_poll(self):
+        self.updated_sections = set()
+        self.changed = frozenset()
+        self.client_diff = EMPTY_DIFF
+        if not self.health.online:
+            raise UpdateFailed(f"Router {self.entry.data['host']} is {self.health.state}")
+        if self.health.login_blocked:
+            raise UpdateFailed(f"Login to {self.entry.data['host']} failed, waiting before retrying")
+        try:
+            if not self.hass.data[DOMAIN].get(f"{self.entry.entry_id}_fetch_enabled", True):
+                return self.data or MR200Data()
+
+            # Automations may start or stop listening for state events at any time
+            if self._event_consumers is not None and async_event_consumers(self.hass) != self._event_consumers:
+                self.async_update_plan()
+
+            due = self._due_sections()
+            if not due:
+                return self.data
+
+            acts = [self.plan[name] for name in due]
+            sms_page = self.sms_inbox.listing_page
+            if "sms" in due:
+                acts += self.sms_inbox.listing_acts()
+            results = await self.session.async_call(self.session.client.read_sections, acts, timeout=POLL_TIMEOUT)
+
+            now = time.monotonic()
+            for name, result in zip(due, results):
+                self._raw[name] = result
+                self._fetched_at[name] = now
+            self.updated_sections = set(due)
+
+            if "clients" in self.updated_sections:
+                client_diff = self.client_index.update(self._raw["clients"])
+                # Without a stored or earlier listing, the first one is a baseline rather than joins
+                if self._clients_known:
+                    self.client_diff = client_diff
+                self._clients_known = True
+
+            sms_mark = self.sms_inbox.high_water_mark
+            if "sms" in self.updated_sections:
+                try:
+                    await self.sms_inbox.async_sync(
+                        self.session,
+                        int(self._raw["sms"].get("totalNumber", "0") or 0),
+                        (sms_page, results[-1]),
+                    )
+                except Exception as err:
+                    _LOGGER.warning("Error syncing SMS inbox: %s", err)
+
+            data = self._build_data()
+            if "lte_intf" in self.updated_sections:
+                self.usage.async_add_total(data.lte_total_statistics)
+            self.changed = changed_fields(self.data, data)
+            if "device_info" in self.changed:
+                self.device = build_device(data.device_info)
+            self.events.async_publish(self.data, data, self.changed, self.client_diff, self.client_index)
+            self.health.async_record_success()
+            if self.changed or any(self.client_diff) or self.sms_inbox.high_water_mark != sms_mark:
+                self.store.async_delay_save(self._stored_state, SAVE_DELAY)
+            return data
+        except LoginFailedException:
+            self.health.async_record_login_failure()
+            raise
+        except Exception as err:
+            _LOGGER.error("Error updating data: %s", err)
+            if isinstance(err, UNREACHABLE_ERRORS):
+                self.health.async_record_failure()
+            raise
+
+    def _build_data(self):
+        device_info = self._raw.get("device_info", {})
+        lte_link = self._raw.get("lte_link")
+        lte_intf = self._raw.get("lte_intf")
+        data = {}
+
+        if lte_link:
+            signal = lte_link.get("signalStrength")
+            network_type = lte_link.get("networkType")
+            sim_status = lte_link.get("simStatus")
+            data["lte_signal_level"] = SIGNAL_LEVELS.get(signal, 0) if signal is not None else None
+            data["lte_enabled"] = lte_link.get("enable")
+            data["lte_network_type"] = network_type
+            data["lte_network_type_info"] = NETWORK_TYPES.get(network_type, "Unknown") if network_type is not None else None
+            data["lte_sim_status"] = sim_status
+            data["lte_sim_status_info"] = SIM_STATUSES.get(sim_status, "Unknown") if sim_status is not None else None
+            data["lte_connect_status"] = lte_link.get("connectStatus")
+        if lte_intf:
+            data["lte_current_rx_speed"] = _number(lte_intf.get("curRxSpeed"), int)
+            data["lte_current_tx_speed"] = _number(lte_intf.get("curTxSpeed"), int)
+            data["lte_total_statistics"] = _number(lte_intf.get("totalStatistics"), float)
+
+        for entry in self._raw.get("wlan", []):
+            band = entry["stack"].split(",")[1]
+            key = {"1": "wifi_2_4ghz", "2": "wifi_5ghz"}.get(band)
+            if key:
+                data[key] = entry.get("enable") == "1"
+        for entry in self._raw.get("wlan_guest", []):
+            stack = entry["stack"].split(",")
+            key = {"1": "guest_2_4ghz", "2": "guest_5ghz"}.get(stack[1])
+            if key and stack[2] == "1":
+                data[key] = entry.get("enable") == "1"
+
+        return MR200Data(
+            device_info=MR200DeviceInfo(
+                manufacturer=device_info.get("manufacturer", ""),
+                model=device_info.get("modelName", ""),
+                hw_version=device_info.get("hardwareVersion", ""),
+                sw_version=device_info.get("softwareVersion", ""),
+                device_url=f"http://{self.entry.data['host']}",
+                mac_address=self._raw.get("wan_ip_conn", {}).get("MACAddress", ""),
+            ),
+            lte_isp_name=self._raw.get("lte_wan", {}).get("profileName", "Unknown"),
+            connection_type=self._raw.get("wan_common", {}).get("WANAccessType", "Unknown"),
+            total_clients=len(self.client_index.clients),
+            unread_sms=_number(self._raw.get("sms_unread", {}).get("smsUnreadCount"), int),
+            **data,
+        )
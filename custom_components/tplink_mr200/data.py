@@ -0,0 +1,83 @@
+from dataclasses import asdict, dataclass, fields
+
+SIGNAL_LEVELS = {"1": 25, "2": 50, "3": 75, "4": 100}
+
+NETWORK_TYPES = {
+    "0": "No Service",
+    "1": "GSM",
+    "2": "WCDMA",
+    "3": "4G LTE",
+    "4": "TD-SCDMA",
+    "5": "CDMA 1x",
+    "6": "CDMA 1x Ev-Do",
+    "7": "4G+ LTE"
+}
+
+SIM_STATUSES = {
+    "0": "No SIM card detected or SIM card error.",
+    "1": "No SIM card detected.",
+    "2": "SIM card error.",
+    "3": "SIM card prepared.",
+    "4": "SIM locked.",
+    "5": "SIM unlocked. Authentication succeeded.",
+    "6": "PIN locked.",
+    "7": "SIM card is locked permanently.",
+    "8": "suspension of transmission",
+    "9": "Unopened"
+}
+
+CONNECT_STATUS_CONNECTED = "4"
+
+@dataclass(frozen=True, slots=True)
+class MR200DeviceInfo:
+    manufacturer: str = ""
+    model: str = ""
+    hw_version: str = ""
+    sw_version: str = ""
+    device_url: str = ""
+    mac_address: str = ""
+
+@dataclass(frozen=True, slots=True)
+class MR200Data:
+    device_info: MR200DeviceInfo = MR200DeviceInfo()
+    lte_signal_level: int | None = None
+    lte_enabled: str | None = None
+    lte_network_type: str | None = None
+    lte_network_type_info: str | None = None
+    lte_sim_status: str | None = None
+    lte_sim_status_info: str | None = None
+    lte_connect_status: str | None = None
+    lte_current_rx_speed: int | None = None
+    lte_current_tx_speed: int | None = None
+    lte_total_statistics: float | None = None
+    lte_isp_name: str = "Unknown"
+    connection_type: str = "Unknown"
+    total_clients: int = 0
+    unread_sms: int | None = None
+    wifi_2_4ghz: bool | None = None
+    wifi_5ghz: bool | None = None
+    guest_2_4ghz: bool | None = None
+    guest_5ghz: bool | None = None
+
+FIELD_NAMES = tuple(field.name for field in fields(MR200Data))
+
+def changed_fields(old, new):
+    if old is None:
+        return frozenset(FIELD_NAMES)
+    return frozenset(
+        name for name in FIELD_NAMES
+        if getattr(old, name) != getattr(new, name)
+    )
+
+def snapshot_to_dict(data):
+    return asdict(data)
+
+def snapshot_from_dict(stored):
+    values = {name: stored[name] for name in FIELD_NAMES if name in stored}
+    device_info = values.get("device_info") or {}
+    values["device_info"] = MR200DeviceInfo(**{
+        field.name: device_info[field.name]
+        for field in fields(MR200DeviceInfo)
+        if field.name in device_info
+    })
+    return MR200Data(**values)
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN
+from .data import MR200DeviceInfo
+
+@dataclass(frozen=True, slots=True)
+class MR200Device:
+    slug: str
+    info: DeviceInfo
+
+def device_slug(device_info: MR200DeviceInfo):
+    manufacturer = device_info.manufacturer.lower().replace(" ", "_").replace("-", "_")
+    model = device_info.model.lower().replace("archer", "").replace(" ", "_")
+    return f"{manufacturer}_{model}"
+
+def build_device(device_info: MR200DeviceInfo):
+    mac = device_info.mac_address
+    return MR200Device(
+        slug=device_slug(device_info),
+        info=DeviceInfo(
+            identifiers={(DOMAIN, mac)},
+            connections={(dr.CONNECTION_NETWORK_MAC, mac)},
+            name="TP-Link MR200",
+            manufacturer=device_info.manufacturer or "TP-Link",
+            model=device_info.model or "MR200",
+            hw_version=device_info.hw_version,
+            sw_version=device_info.sw_version,
+            configuration_url=device_info.device_url,
+        ),
+    )
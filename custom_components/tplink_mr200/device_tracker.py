@@ -0,0 +1,67 @@
+from homeassistant.components.device_tracker import ScannerEntity
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    tracked = set()
+
+    @callback
+    def async_add_new_clients():
+        new = coordinator.client_index.clients.keys() - tracked
+        if new:
+            tracked.update(new)
+            async_add_entities(ClientTracker(coordinator, mac) for mac in new)
+
+    async_add_new_clients()
+    config_entry.async_on_unload(coordinator.async_add_listener(async_add_new_clients))
+
+class ClientTracker(CoordinatorEntity, ScannerEntity):
+    def __init__(self, coordinator, mac):
+        super().__init__(coordinator)
+        self._mac = mac
+        self._last_available = None
+        mac_slug = mac.lower().replace(":", "").replace("-", "")
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_client_{mac_slug}"
+        coordinator.async_register_consumer("device_tracker", self._attr_unique_id, "client_trackers")
+        self._attr_name = coordinator.client_index.clients[mac][1] or mac
+        self._attr_icon = "mdi:lan-connect"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        diff = self.coordinator.client_diff
+        available = self.available
+        if (
+            available != self._last_available
+            or self._mac in diff.joined
+            or self._mac in diff.left
+            or self._mac in diff.changed
+        ):
+            self._last_available = available
+            self.async_write_ha_state()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._mac in self.coordinator.client_index.clients
+
+    @property
+    def mac_address(self) -> str:
+        return self._mac
+
+    @property
+    def ip_address(self):
+        client = self.coordinator.client_index.clients.get(self._mac)
+        return client[0] if client else None
+
+    @property
+    def hostname(self):
+        client = self.coordinator.client_index.clients.get(self._mac)
+        return client[1] if client else None
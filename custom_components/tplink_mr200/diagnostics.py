@@ -0,0 +1,31 @@
+from dataclasses import asdict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_HOST, CONF_PASSWORD
+
+# The title and the device URL carry the router address, so they go with the host.
+TO_REDACT = {CONF_HOST, CONF_USERNAME, CONF_PASSWORD, "title", "device_url", "mac_address"}
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    client = hass.data[DOMAIN][entry.entry_id]["client"]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "intervals": coordinator.intervals,
+        "client": {
+            "request_count": client.request_count,
+            "bytes_sent": client.bytes_sent,
+            "bytes_received": client.bytes_received,
+            "logged_in": client.logged_in,
+        },
+        "health": {
+            "state": coordinator.health.state,
+            "failures": coordinator.health.failures,
+        },
+        "metrics": client.metrics.as_dict(),
+        "data": async_redact_data(asdict(coordinator.data), TO_REDACT) if coordinator.data else None,
+    }
@@ -0,0 +1,80 @@
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    EVENT_WAN_CHANGED,
+    EVENT_NETWORK_TYPE_CHANGED,
+    EVENT_SIM_STATUS_CHANGED,
+    EVENT_CLIENT_JOINED,
+    EVENT_CLIENT_LEFT,
+    EVENT_UNREAD_SMS_CHANGED,
+)
+from .data import CONNECT_STATUS_CONNECTED
+
+# Fields behind each event are only fetched while something listens for it
+EVENT_CONSUMERS = {
+    EVENT_WAN_CHANGED: "wan_events",
+    EVENT_NETWORK_TYPE_CHANGED: "network_type_events",
+    EVENT_SIM_STATUS_CHANGED: "sim_status_events",
+    EVENT_CLIENT_JOINED: "client_events",
+    EVENT_CLIENT_LEFT: "client_events",
+    EVENT_UNREAD_SMS_CHANGED: "unread_sms_events",
+}
+
+@callback
+def async_event_consumers(hass: HomeAssistant):
+    listeners = hass.bus.async_listeners()
+    return frozenset(
+        consumer for event_type, consumer in EVENT_CONSUMERS.items() if listeners.get(event_type)
+    )
+
+class StateEvents:
+    def __init__(self, hass: HomeAssistant, entry_id, host):
+        self._hass = hass
+        self._entry_id = entry_id
+        self._host = host
+
+    def _fire(self, event_type, data):
+        self._hass.bus.async_fire(event_type, {"entry_id": self._entry_id, "host": self._host, **data})
+
+    @callback
+    def async_publish(self, old, new, changed, client_diff, client_index):
+        if old is None:
+            return
+        self._publish_link(old, new, changed)
+        for mac in sorted(client_diff.joined):
+            ip, hostname = client_index.clients[mac]
+            self._fire(EVENT_CLIENT_JOINED, {"mac": mac, "ip": ip, "hostname": hostname})
+        for mac in sorted(client_diff.left):
+            ip, hostname = client_index.previous[mac]
+            self._fire(EVENT_CLIENT_LEFT, {"mac": mac, "ip": ip, "hostname": hostname})
+
+    def _publish_link(self, old, new, changed):
+        if "lte_connect_status" in changed and None not in (old.lte_connect_status, new.lte_connect_status):
+            was_up = old.lte_connect_status == CONNECT_STATUS_CONNECTED
+            is_up = new.lte_connect_status == CONNECT_STATUS_CONNECTED
+            if was_up != is_up:
+                self._fire(EVENT_WAN_CHANGED, {
+                    "state": "up" if is_up else "down",
+                    "before": old.lte_connect_status,
+                    "after": new.lte_connect_status,
+                })
+        if "lte_network_type" in changed and None not in (old.lte_network_type, new.lte_network_type):
+            self._fire(EVENT_NETWORK_TYPE_CHANGED, {
+                "before": old.lte_network_type_info,
+                "after": new.lte_network_type_info,
+                "before_code": old.lte_network_type,
+                "after_code": new.lte_network_type,
+            })
+        if "lte_sim_status" in changed and None not in (old.lte_sim_status, new.lte_sim_status):
+            self._fire(EVENT_SIM_STATUS_CHANGED, {
+                "before": old.lte_sim_status_info,
+                "after": new.lte_sim_status_info,
+                "before_code": old.lte_sim_status,
+                "after_code": new.lte_sim_status,
+            })
+        if "unread_sms" in changed and None not in (old.unread_sms, new.unread_sms):
+            self._fire(EVENT_UNREAD_SMS_CHANGED, {
+                "before": old.unread_sms,
+                "after": new.unread_sms,
+                "delta": new.unread_sms - old.unread_sms,
+            })
@@ -0,0 +1,118 @@
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .metrics import BUCKETS
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+FAMILIES = (
+    ("up", "gauge", "Whether the router answered its last poll"),
+    ("lte_signal_level", "gauge", "LTE signal level in percent"),
+    ("lte_rx_bytes_per_second", "gauge", "Current LTE download speed"),
+    ("lte_tx_bytes_per_second", "gauge", "Current LTE upload speed"),
+    ("lte_traffic_bytes", "counter", "LTE traffic counter reported by the router, resets on reboot"),
+    ("lte_usage_bytes", "gauge", "LTE traffic over the labelled period"),
+    ("clients", "gauge", "Connected LAN clients"),
+    ("sms_unread", "gauge", "Unread SMS messages"),
+    ("sms_inbox", "gauge", "SMS messages in the inbox"),
+    ("logins", "counter", "Logins performed by the integration"),
+    ("poll_duration_seconds", "histogram", "Duration of coordinator polls"),
+)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _labels(labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+def _samples(coordinator):
+    data = coordinator.data
+    host = {"host": coordinator.entry.data["host"]}
+    metrics = coordinator.session.client.metrics
+    samples = {name: [] for name, _, _ in FAMILIES}
+
+    samples["up"].append(("", host, int(coordinator.health.online and coordinator.last_update_success)))
+    if data is not None:
+        for name, value in (
+            ("lte_signal_level", data.lte_signal_level),
+            ("lte_rx_bytes_per_second", data.lte_current_rx_speed),
+            ("lte_tx_bytes_per_second", data.lte_current_tx_speed),
+            ("clients", data.total_clients),
+            ("sms_unread", data.unread_sms),
+        ):
+            if value is not None:
+                samples[name].append(("", host, value))
+        if data.lte_total_statistics is not None:
+            samples["lte_traffic_bytes"].append(("_total", host, data.lte_total_statistics))
+
+    usage = coordinator.usage
+    for period, value in (
+        ("today", usage.period("today")),
+        ("billing_cycle", usage.period("billing_cycle")),
+        ("30d", usage.rolling),
+    ):
+        if value is not None:
+            samples["lte_usage_bytes"].append(("", {**host, "period": period}, value))
+    if coordinator.sms_inbox.total is not None:
+        samples["sms_inbox"].append(("", host, coordinator.sms_inbox.total))
+    samples["logins"].append(("_total", host, metrics.get("login").count))
+
+    poll = metrics.get("poll")
+    cumulative = 0
+    for bound, count in zip([*map(str, BUCKETS), "+Inf"], poll.buckets):
+        cumulative += count
+        samples["poll_duration_seconds"].append(("_bucket", {**host, "le": bound}, cumulative))
+    samples["poll_duration_seconds"].append(("_count", host, poll.count))
+    samples["poll_duration_seconds"].append(("_sum", host, round(poll.total, 6)))
+    return samples
+
+class MetricsExporter:
+    def __init__(self):
+        self._entries = {}
+        self.body = b"# EOF\n"
+
+    @callback
+    def async_update(self, coordinator):
+        self._entries[coordinator.entry.entry_id] = _samples(coordinator)
+        self._render()
+
+    @callback
+    def async_remove(self, entry_id):
+        if self._entries.pop(entry_id, None) is not None:
+            self._render()
+
+    def _render(self):
+        lines = []
+        for name, metric_type, help_text in FAMILIES:
+            family = f"{DOMAIN}_{name}"
+            lines.append(f"# TYPE {family} {metric_type}")
+            lines.append(f"# HELP {family} {help_text}")
+            for samples in self._entries.values():
+                lines.extend(
+                    f"{family}{suffix}{_labels(labels)} {value}"
+                    for suffix, labels, value in samples[name]
+                )
+        lines.append("# EOF")
+        self.body = ("\n".join(lines) + "\n").encode("utf-8")
+
+class MetricsView(HomeAssistantView):
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    def __init__(self, exporter: MetricsExporter):
+        self._exporter = exporter
+
+    async def get(self, request):
+        return web.Response(body=self._exporter.body, headers={"Content-Type": CONTENT_TYPE})
+
+@callback
+def async_get_exporter(hass: HomeAssistant) -> MetricsExporter:
+    exporter = hass.data[DOMAIN].get("exporter")
+    if exporter is None:
+        exporter = hass.data[DOMAIN]["exporter"] = MetricsExporter()
+        hass.http.register_view(MetricsView(exporter))
+    return exporter
@@ -0,0 +1,36 @@
+from .const import (
+    CONF_DEADBAND,
+    CONF_DEADBAND_RELATIVE,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_MAX_WRITE_AGE,
+)
+
+class SensorFilter:
+    def __init__(self, deadband=0, relative=False, min_interval=0, max_age=0):
+        self.deadband = deadband
+        self.relative = relative
+        self.min_interval = min_interval
+        self.max_age = max_age
+
+    def accept(self, previous, value, elapsed):
+        if previous is None or value is None:
+            return True
+        if self.max_age and elapsed >= self.max_age:
+            return True
+        if elapsed < self.min_interval:
+            return False
+        threshold = abs(previous) * self.deadband / 100 if self.relative else self.deadband
+        return abs(value - previous) > threshold
+
+def sensor_filter(options, key):
+    deadband = options.get(f"{key}_{CONF_DEADBAND}", 0)
+    min_interval = options.get(f"{key}_{CONF_MIN_WRITE_INTERVAL}", 0)
+    max_age = options.get(f"{key}_{CONF_MAX_WRITE_AGE}", 0)
+    if not (deadband or min_interval or max_age):
+        return None
+    return SensorFilter(
+        deadband,
+        options.get(f"{key}_{CONF_DEADBAND_RELATIVE}", False),
+        min_interval,
+        max_age,
+    )
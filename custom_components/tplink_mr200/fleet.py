@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import random
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import DOMAIN, MAX_CONCURRENT_POLLS
+
+_LOGGER = logging.getLogger(__name__)
+
+POLL_TIMEOUT = 30
+
+class FleetScheduler:
+    def __init__(self, hass: HomeAssistant, max_concurrent=MAX_CONCURRENT_POLLS):
+        self._hass = hass
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self._in_flight = {}
+        self._requested = set()
+
+    @callback
+    def async_register(self, coordinator):
+        interval = coordinator.tick
+        unsubs = []
+
+        @callback
+        def _async_tick(_now=None):
+            if coordinator.entry.entry_id in self._in_flight:
+                _LOGGER.debug("Skipping poll of %s, previous poll still running", coordinator.entry.title)
+                return
+            self.async_request_poll(coordinator)
+
+        @callback
+        def _async_start(_now):
+            unsubs.append(async_track_time_interval(self._hass, _async_tick, timedelta(seconds=interval)))
+            _async_tick()
+
+        unsubs.append(async_call_later(self._hass, random.uniform(0, interval), _async_start))
+
+        @callback
+        def _async_unregister():
+            for unsub in unsubs:
+                unsub()
+            unsubs.clear()
+            entry_id = coordinator.entry.entry_id
+            self._requested.discard(entry_id)
+            task = self._in_flight.pop(entry_id, None)
+            if task:
+                task.cancel()
+
+        return _async_unregister
+
+    @callback
+    def async_request_poll(self, coordinator):
+        entry_id = coordinator.entry.entry_id
+        if entry_id in self._in_flight:
+            # Poll again once the running poll is done, so sections invalidated meanwhile are read
+            self._requested.add(entry_id)
+            return
+        self._in_flight[entry_id] = self._hass.async_create_background_task(
+            self._async_poll(coordinator), f"{DOMAIN} poll {entry_id}"
+        )
+
+    async def _async_poll(self, coordinator):
+        entry_id = coordinator.entry.entry_id
+        try:
+            while True:
+                self._requested.discard(entry_id)
+                try:
+                    async with self.semaphore:
+                        async with asyncio.timeout(POLL_TIMEOUT):
+                            await coordinator.async_refresh()
+                except TimeoutError:
+                    _LOGGER.warning("Poll of %s timed out", coordinator.entry.title)
+                if entry_id not in self._requested:
+                    return
+        finally:
+            if self._in_flight.get(entry_id) is asyncio.current_task():
+                del self._in_flight[entry_id]
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> FleetScheduler:
+    data = hass.data.setdefault(DOMAIN, {})
+    scheduler = data.get("scheduler")
+    if scheduler is None:
+        scheduler = data["scheduler"] = FleetScheduler(hass)
+    return scheduler
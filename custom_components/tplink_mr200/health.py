@@ -0,0 +1,107 @@
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .mr200 import MR200Client
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_ONLINE = "online"
+STATE_OFFLINE = "offline"
+STATE_REBOOTING = "rebooting"
+
+FAILURE_THRESHOLD = 2
+BACKOFF_MIN = 5
+BACKOFF_MAX = 300
+REBOOT_GRACE = 15
+REBOOT_PROBE_INTERVAL = 3
+REBOOT_TIMEOUT = 180
+LOGIN_BACKOFF_MAX = 3600
+
+class RouterHealth:
+    def __init__(self, hass: HomeAssistant, client: MR200Client, on_recovered, clock=time.monotonic):
+        self._hass = hass
+        self._client = client
+        self._on_recovered = on_recovered
+        self._clock = clock
+        self.state = STATE_ONLINE
+        self.failures = 0
+        self._backoff = BACKOFF_MIN
+        self._reboot_deadline = 0.0
+        self._login_backoff = 0
+        self._login_retry_at = 0.0
+        self._unsub = None
+
+    @property
+    def online(self):
+        return self.state == STATE_ONLINE
+
+    @property
+    def login_blocked(self):
+        return self._clock() < self._login_retry_at
+
+    @property
+    def available(self):
+        return self.online and not self.login_blocked
+
+    @callback
+    def async_record_success(self):
+        self.failures = 0
+        self._backoff = BACKOFF_MIN
+        self._login_backoff = 0
+        self._login_retry_at = 0.0
+
+    @callback
+    def async_record_failure(self):
+        self.failures += 1
+        if self.online and self.failures >= FAILURE_THRESHOLD:
+            _LOGGER.warning("Router %s is unreachable, backing off", self._client.router_ip)
+            self.state = STATE_OFFLINE
+            self._async_schedule_probe(self._backoff)
+
+    @callback
+    def async_record_login_failure(self):
+        self._login_backoff = min(max(self._login_backoff * 2, BACKOFF_MIN), LOGIN_BACKOFF_MAX)
+        self._login_retry_at = self._clock() + self._login_backoff
+        _LOGGER.warning(
+            "Login to %s failed, retrying in %s seconds", self._client.router_ip, self._login_backoff
+        )
+
+    @callback
+    def async_mark_rebooting(self):
+        self.state = STATE_REBOOTING
+        self._reboot_deadline = self._clock() + REBOOT_TIMEOUT
+        self._async_schedule_probe(REBOOT_GRACE)
+
+    @callback
+    def async_stop(self):
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_schedule_probe(self, delay):
+        self.async_stop()
+        self._unsub = async_call_later(self._hass, delay, self._async_probe)
+
+    async def _async_probe(self, _now):
+        self._unsub = None
+        if await self._client.probe():
+            _LOGGER.info("Router %s is reachable again", self._client.router_ip)
+            self.state = STATE_ONLINE
+            self.failures = 0
+            await self._on_recovered()
+            return
+        if self.state == STATE_REBOOTING and self._clock() >= self._reboot_deadline:
+            _LOGGER.warning("Router %s did not come back after a reboot, backing off", self._client.router_ip)
+            self.state = STATE_OFFLINE
+            self._backoff = BACKOFF_MIN
+            self._async_schedule_probe(self._backoff)
+            return
+        if self.state == STATE_OFFLINE:
+            self._backoff = min(self._backoff * 2, BACKOFF_MAX)
+            self._async_schedule_probe(self._backoff)
+        else:
+            self._async_schedule_probe(REBOOT_PROBE_INTERVAL)
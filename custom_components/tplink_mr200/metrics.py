@@ -0,0 +1,70 @@
+import time
+from contextlib import contextmanager
+
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+class OperationStats:
+    __slots__ = ("count", "failures", "total", "last", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.last = None
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, duration, failed=False):
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        if failed:
+            self.failures += 1
+        for i, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    @property
+    def error_rate(self):
+        return self.failures / self.count if self.count else 0.0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "mean": round(self.total / self.count, 4) if self.count else None,
+            "last": round(self.last, 4) if self.last is not None else None,
+            "buckets": dict(zip([*map(str, BUCKETS), "+Inf"], self.buckets)),
+        }
+
+class ClientMetrics:
+    def __init__(self):
+        self.operations = {}
+
+    def get(self, name):
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = self.operations[name] = OperationStats()
+        return stats
+
+    def observe(self, name, duration, failed=False):
+        self.get(name).observe(duration, failed)
+
+    @contextmanager
+    def measure(self, *names):
+        start = time.monotonic()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            duration = time.monotonic() - start
+            for name in names:
+                self.observe(name, duration, failed)
+
+    def as_dict(self):
+        return {name: stats.as_dict() for name, stats in sorted(self.operations.items())}
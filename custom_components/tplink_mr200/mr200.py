@@ -1,170 +1,274 @@
 import rsa
 import binascii
 import base64
-import requests
+import asyncio
+import aiohttp
 import re
+import hashlib
+from collections import namedtuple
+
+from .metrics import ClientMetrics
+
+ACT_GET = 1
+ACT_SET = 2
+ACT_GL = 5
+ACT_OP = 7
+ACT_CGI = 8
+
+REQUEST_TIMEOUT = 10
+PROBE_TIMEOUT = 3
+TOKEN_TIMEOUT = 5
+TOKEN_CHUNK_SIZE = 4096
+TOKEN_MAX_BYTES = 256 * 1024
+
+Act = namedtuple("Act", ["type", "oid", "stack", "pstack", "attrs"], defaults=["0,0,0,0,0,0", "0,0,0,0,0,0", ()])
+
+def wifi_act(band, enabled, is_guest=False):
+	enable_value = "1" if enabled else "0"
+	if is_guest:
+		return Act(ACT_SET, "LAN_WLAN_MSSIDENTRY", f"1,{band},1,0,0,0", attrs=(f"enable={enable_value}",))
+	return Act(ACT_SET, "LAN_WLAN", f"1,{band},0,0,0,0", attrs=(f"enable={enable_value}",))
 
 class NotLoggedInException(Exception):
 	pass
 
+# Raised when the request was refused before the router acted on it, so it is safe to send again
+class RequestRejectedException(NotLoggedInException):
+	pass
+
 class LoginFailedException(Exception):
 	pass
 
 class ConnectionFailedException(Exception):
 	pass
 
+class RequestFailedException(Exception):
+	def __init__(self, code):
+		super().__init__(f"Router returned error code {code}")
+		self.code = code
+
+CgiResponse = namedtuple("CgiResponse", ["sections", "error"])
+
+_TOKEN_RE = re.compile(rb'var token="([^"]*)";')
+_HEADER_RE = re.compile(r"\[((\d+),\d+,\d+,\d+,\d+,\d+)\](\d+)$")
+_ERROR_PREFIX = "[error]"
+
+def parse_response(data, acts):
+	sections = [[] if act.type == ACT_GL else {} for act in acts]
+	error = None
+	record = None
+	for line in data.decode('utf8', 'replace').splitlines():
+		if line.startswith("["):
+			if line.startswith(_ERROR_PREFIX):
+				error = int(line[len(_ERROR_PREFIX):] or 0)
+				record = None
+				continue
+			match = _HEADER_RE.match(line)
+			if match is None:
+				continue
+			index = int(match.group(3))
+			if index >= len(sections):
+				record = None
+			elif acts[index].type == ACT_GL:
+				record = {"idx": int(match.group(2)), "stack": match.group(1)}
+				sections[index].append(record)
+			else:
+				record = sections[index]
+		elif record is not None:
+			key, sep, value = line.partition("=")
+			if sep:
+				record[key] = value
+	return CgiResponse(sections, error)
+
+class CredentialCache:
+	def __init__(self):
+		self._entries = {}
+
+	@staticmethod
+	def __fingerprint(username, password):
+		return hashlib.sha256(f"{username}\0{password}".encode('utf8')).digest()
+
+	def get(self, host, modulus, username, password):
+		entry = self._entries.get((host, modulus))
+		if entry is not None and entry[0] == self.__fingerprint(username, password):
+			return entry[1]
+		return None
+
+	def put(self, host, modulus, username, password, blobs):
+		self.invalidate(host)
+		self._entries[(host, modulus)] = (self.__fingerprint(username, password), blobs)
+
+	def invalidate(self, host):
+		for key in [key for key in self._entries if key[0] == host]:
+			del self._entries[key]
+
+CREDENTIAL_CACHE = CredentialCache()
+
 class MR200Client:
-	def __init__(self, router_ip):
+	def __init__(self, router_ip, session: aiohttp.ClientSession, timeout=REQUEST_TIMEOUT):
 		self.router_ip = router_ip
 		self.cgi_url = f"http://{router_ip}/cgi"
-		self.session = requests.Session()
-		self.session.headers = {'referer': f'http://{self.router_ip}/', 'origin': f'http://{self.router_ip}'}
+		self.session = session
+		self.timeout = aiohttp.ClientTimeout(total=timeout)
+		self.headers = {'referer': f'http://{self.router_ip}/', 'origin': f'http://{self.router_ip}'}
+		self.jsessionid = None
+		self.modulus = None
+		self.request_count = 0
+		self.bytes_sent = 0
+		self.bytes_received = 0
+		self.metrics = ClientMetrics()
+
+	def __update_cookies(self, r):
+		if "JSESSIONID" in r.cookies:
+			self.jsessionid = r.cookies["JSESSIONID"].value
+			self.headers["Cookie"] = f"JSESSIONID={self.jsessionid}"
 
-	def __get_params(self, retry=False):
+	async def __request(self, method, url, data=None, timeout=None):
+		self.request_count += 1
+		self.bytes_sent += len(data) if data else 0
+		async with self.session.request(method, url, data=data, headers=self.headers, timeout=timeout or self.timeout) as r:
+			self.__update_cookies(r)
+			body = await r.read()
+			self.bytes_received += len(body)
+			return r.status, body
+
+	async def __get_params(self, retry=False):
 		try:
-			r = self.session.get(f"{self.cgi_url}/getParm", timeout=5)
+			with self.metrics.measure("login.get_parm"):
+				_, body = await self.__request("GET", f"{self.cgi_url}/getParm", timeout=aiohttp.ClientTimeout(total=5))
 			result = {}
-			for line in r.text.splitlines()[0:2]:
+			for line in body.decode('utf8').splitlines()[0:2]:
 				match = re.search(r"var (.*)=\"(.*)\"", line)
 				result[match.group(1)] = int(match.group(2), 16)
 			return result
-		except:
+		except (aiohttp.ClientError, asyncio.TimeoutError, AttributeError, ValueError):
 			if not retry:
-				return self.__get_params(True)
+				return await self.__get_params(True)
 			raise ConnectionFailedException()
 
-	def __check_login_status(self):
-		if not "TokenID" in self.session.headers or not "JSESSIONID" in self.session.cookies:
-			raise NotLoggedInException()
-
-	def login(self, username, password):
-		params = self.__get_params()
-		pub_key = rsa.PublicKey(n=params["nn"], e=params["ee"])
-
-		rsa_username = binascii.hexlify(rsa.encrypt(username.encode('utf8'), pub_key)).decode('utf8')
-		rsa_password = binascii.hexlify(rsa.encrypt(base64.b64encode(password.encode('utf8')), pub_key)).decode('utf8')
+	async def __fetch_token(self):
+		self.request_count += 1
+		timeout = aiohttp.ClientTimeout(total=TOKEN_TIMEOUT)
+		async with self.session.get(f'http://{self.router_ip}/', headers=self.headers, timeout=timeout) as r:
+			self.__update_cookies(r)
+			buffer = b""
+			async for chunk in r.content.iter_chunked(TOKEN_CHUNK_SIZE):
+				start = max(len(buffer) - 64, 0)
+				buffer += chunk
+				self.bytes_received += len(chunk)
+				match = _TOKEN_RE.search(buffer, start)
+				if match:
+					# Leaving before EOF closes the connection instead of reading the rest of the page
+					return match.group(1).decode('utf8', 'replace')
+				if len(buffer) > TOKEN_MAX_BYTES:
+					break
+		return None
 
-		self.session.post(f'{self.cgi_url}/login?UserName={rsa_username}&Passwd={rsa_password}&Action=1&LoginStatus=0')
-		r = self.session.get(f'http://{self.router_ip}/')
+	async def probe(self):
 		try:
-			self.session.headers["TokenID"] = re.search(r"var token=\"(.*)\";", r.text).group(1)
-		except AttributeError:
-			raise LoginFailedException()
+			status, _ = await self.__request("GET", f"{self.cgi_url}/getParm", timeout=aiohttp.ClientTimeout(total=PROBE_TIMEOUT))
+			return status == 200
+		except (aiohttp.ClientError, asyncio.TimeoutError):
+			return False
 
-	def __make_dict(self, response_text):
-		result = {}
-		for line in response_text.splitlines():
-			if "=" in line:
-				split_str = line.split("=")
-				result[split_str[0]] = split_str[1]
-		return result
-
-	def __make_list_dict(self, response_text):
-		l = []
-		d = {}
-		for line in response_text.splitlines():
-			match = re.search("\\[([0-9]*),.*", line)
-			if match != None:
-				if d:
-					d["idx"] = i
-					l.append(d)
-					d = {}
-				i = int(match.group(1))
-			elif "=" in line:
-				split_str = line.split("=")
-				d[split_str[0]] = split_str[1]
-		if d:
-			d["idx"] = i
-			l.append(d)
-		return l
-
-	def get_wan_ip_connection(self):
-		self.__check_login_status()
-		r = self.session.post(f'{self.cgi_url}?1', data="[WAN_IP_CONN#2,1,1,0,0,0#0,0,0,0,0,0]0,0\r\n")
-		return self.__make_dict(r.text)
+	@property
+	def logged_in(self):
+		return "TokenID" in self.headers and self.jsessionid is not None
 
-	def get_lte_wan_cfg(self):
-		self.__check_login_status()
-		r = self.session.post(f'{self.cgi_url}?1', data="[LTE_WAN_CFG#2,1,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
-		return self.__make_dict(r.text)
+	def __check_login_status(self):
+		if not self.logged_in:
+			raise RequestRejectedException()
 
-	def get_lan_wlan_mssidentry(self):
-		self.__check_login_status()
-		r = self.session.post(f'{self.cgi_url}?5', data="[LAN_WLAN_MSSIDENTRY#0,0,0,0,0,0#1,0,0,0,0,0]0,0\r\n")
-		return self.__make_list_dict(r.text)
+	async def __post(self, acts):
+		types = "&".join(str(act.type) for act in acts)
+		data = "".join(
+			f"[{act.oid}#{act.stack}#{act.pstack}]{i},{len(act.attrs)}\r\n" + "".join(f"{attr}\r\n" for attr in act.attrs)
+			for i, act in enumerate(acts)
+		)
+		with self.metrics.measure("cgi", *{f"section.{act.oid}" for act in acts}):
+			status, body = await self.__request("POST", f'{self.cgi_url}?{types}', data=data)
+		with self.metrics.measure("parse"):
+			response = parse_response(body, acts)
+		if status in (401, 403):
+			self.headers.pop("TokenID", None)
+			raise RequestRejectedException()
+		if response.error is None:
+			self.headers.pop("TokenID", None)
+			raise NotLoggedInException()
+		if response.error != 0:
+			raise RequestFailedException(response.error)
+		return response.sections
 
-	def get_lan_wlan(self):
-		self.__check_login_status()
-		r = self.session.post(f'{self.cgi_url}?5', data="[LAN_WLAN#0,0,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
-		return self.__make_list_dict(r.text)
+	async def __encrypt_credentials(self, username, password):
+		params = await self.__get_params()
+		self.modulus = params["nn"]
+		blobs = CREDENTIAL_CACHE.get(self.router_ip, self.modulus, username, password)
+		if blobs is None:
+			with self.metrics.measure("login.encrypt"):
+				pub_key = rsa.PublicKey(n=params["nn"], e=params["ee"])
+				rsa_username = binascii.hexlify(rsa.encrypt(username.encode('utf8'), pub_key)).decode('utf8')
+				rsa_password = binascii.hexlify(rsa.encrypt(base64.b64encode(password.encode('utf8')), pub_key)).decode('utf8')
+			blobs = (rsa_username, rsa_password)
+			CREDENTIAL_CACHE.put(self.router_ip, self.modulus, username, password, blobs)
+		return blobs
 
-	def get_wan_lte_link_cfg(self):
-		self.__check_login_status()
-		r = self.session.post(f'{self.cgi_url}?1', data="[WAN_LTE_LINK_CFG#2,1,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
-		return self.__make_list_dict(r.text)
+	async def __authenticate(self, rsa_username, rsa_password):
+		try:
+			with self.metrics.measure("login.post"):
+				await self.__request("POST", f'{self.cgi_url}/login?UserName={rsa_username}&Passwd={rsa_password}&Action=1&LoginStatus=0')
+			with self.metrics.measure("login.token"):
+				token = await self.__fetch_token()
+		except (aiohttp.ClientError, asyncio.TimeoutError):
+			raise ConnectionFailedException()
+		if token is None:
+			raise LoginFailedException()
+		self.headers["TokenID"] = token
 
-	def get_wan_lte_intf_cfg(self):
-		self.__check_login_status()
-		r = self.session.post(f'{self.cgi_url}?1', data="[WAN_LTE_INTF_CFG#2,0,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
-		return self.__make_dict(r.text)
+	async def login(self, username, password):
+		with self.metrics.measure("login"):
+			await self.__login(username, password)
 
-	def get_wan_common_intf_cfg(self):
-		self.__check_login_status()
-		r = self.session.post(f'{self.cgi_url}?1', data="[WAN_COMMON_INTF_CFG#2,0,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
-		return self.__make_dict(r.text)
+	async def __login(self, username, password):
+		blobs = None
+		if self.modulus is not None:
+			blobs = CREDENTIAL_CACHE.get(self.router_ip, self.modulus, username, password)
+		if blobs is not None:
+			try:
+				return await self.__authenticate(*blobs)
+			except LoginFailedException:
+				CREDENTIAL_CACHE.invalidate(self.router_ip)
+		try:
+			await self.__authenticate(*await self.__encrypt_credentials(username, password))
+		except LoginFailedException:
+			CREDENTIAL_CACHE.invalidate(self.router_ip)
+			self.modulus = None
+			raise
 
-	def get_clients(self):
+	async def read_sections(self, acts):
 		self.__check_login_status()
-		r = self.session.post(f'{self.cgi_url}?5', data="[LAN_HOST_ENTRY#0,0,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
-		return self.__make_list_dict(r.text)
+		return await self.__post(acts)
 
-	def get_device_info(self):
+	async def send_sms(self, to, message):
 		self.__check_login_status()
-		r = self.session.post(f'{self.cgi_url}?1', data="[IGD_DEV_INFO#0,0,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
-		return self.__make_dict(r.text)
+		await self.__post([Act(ACT_SET, "LTE_SMS_SENDNEWMSG", attrs=("index=1", f"to={to}", f"textContent={message}"))])
 
-	def get_sms(self):
+	async def write_sections(self, acts):
 		self.__check_login_status()
-		r = self.session.post(f'{self.cgi_url}?2&5', data="[LTE_SMS_RECVMSGBOX#0,0,0,0,0,0#0,0,0,0,0,0]0,1\r\nPageNumber=1\r\n[LTE_SMS_RECVMSGENTRY#0,0,0,0,0,0#0,0,0,0,0,0]1,5\r\nindex\r\nfrom\r\ncontent\r\nreceivedTime\r\nunread\r\n")
-		return self.__make_list_dict(r.text)
+		await self.__post(acts)
 
-	def send_sms(self, to, message):
-		self.__check_login_status()
-		self.session.post(f'{self.cgi_url}?2', data=f"[LTE_SMS_SENDNEWMSG#0,0,0,0,0,0#0,0,0,0,0,0]0,3\r\nindex=1\r\nto={to}\r\ntextContent={message}\r\n")
-
-	# def get_wifi_state(self, band, is_guest=False):
-	# 	self.__check_login_status()
-		
-	# 	if is_guest:
-	# 		r = self.session.post(f'{self.cgi_url}?2', 
-	# 			data=f"[LAN_WLAN_MSSIDENTRY#1,{band},1,0,0,0#0,0,0,0,0,0]0,6\r\n")
-	# 	else:
-	# 		r = self.session.post(f'{self.cgi_url}?2&2&2&2&2', 
-	# 			data=f"[LAN_WLAN#1,{band},0,0,0,0#0,0,0,0,0,0]4,13\r\n")
-		
-	# 	result = self.__make_dict(r.text)
-	# 	return result.get("enable", "0") == "1"
-
-	# def set_wifi_state(self, band, enabled, is_guest=False):
-	# 	self.__check_login_status()
-	# 	enable_value = "1" if enabled else "0"
-		
-	# 	if is_guest:
-	# 		data = f"[LAN_WLAN_MSSIDENTRY#1,{band},1,0,0,0#0,0,0,0,0,0]0,6\r\nenable={enable_value}\r\n"
-	# 		self.session.post(f'{self.cgi_url}?2', data=data)
-	# 	else:
-	# 		data = f"[LAN_WLAN#1,{band},0,0,0,0#0,0,0,0,0,0]4,13\r\nenable={enable_value}\r\n"
-	# 		self.session.post(f'{self.cgi_url}?2&2&2&2&2', data=data)
-
-	def reboot(self):
+	async def set_wifi_state(self, band, enabled, is_guest=False):
+		await self.write_sections([wifi_act(band, enabled, is_guest)])
+
+	async def reboot(self):
 		self.__check_login_status()
-		self.session.post(f'{self.cgi_url}?7', data="[ACT_REBOOT#0,0,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
+		await self.__post([Act(ACT_OP, "ACT_REBOOT")])
+		del self.headers["TokenID"]
 
-	def logout(self):
+	async def logout(self):
 		try:
-			if "TokenID" in self.session.headers:
-				self.session.post(f'{self.cgi_url}?8', data="[/cgi/clearBusy#0,0,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
-				self.session.post(f'{self.cgi_url}?8', data="[/cgi/logout#0,0,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
-				del self.session.headers["TokenID"]
+			if "TokenID" in self.headers:
+				await self.__request("POST", f'{self.cgi_url}?8', data="[/cgi/clearBusy#0,0,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
+				await self.__request("POST", f'{self.cgi_url}?8', data="[/cgi/logout#0,0,0,0,0,0#0,0,0,0,0,0]0,0\r\n")
+				del self.headers["TokenID"]
 		except Exception:
 			pass
\ No newline at end of file
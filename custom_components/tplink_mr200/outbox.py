@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .session import MR200Session, UNSENT_ERRORS
+
+_LOGGER = logging.getLogger(__name__)
+
+class SmsOutbox:
+    def __init__(self, hass: HomeAssistant, session: MR200Session, interval, retries):
+        self._hass = hass
+        self._session = session
+        self._interval = interval
+        self._retries = retries
+        self._queue = asyncio.Queue()
+        self._task = None
+        self._next_send = 0.0
+
+    @callback
+    def async_start(self):
+        self._task = self._hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} sms outbox {self._session.client.router_ip}"
+        )
+
+    @callback
+    def async_stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+
+    async def async_send(self, numbers, text):
+        loop = asyncio.get_running_loop()
+        futures = []
+        for number in numbers:
+            future = loop.create_future()
+            self._queue.put_nowait((number, text, future))
+            futures.append(future)
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+    async def _async_run(self):
+        while True:
+            number, text, future = await self._queue.get()
+            if future.done():
+                continue
+            try:
+                await self._async_send(number, text)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as err:
+                _LOGGER.error("Error sending SMS to %s: %s", number, err)
+                if not future.done():
+                    future.set_exception(err)
+            else:
+                if not future.done():
+                    future.set_result(None)
+
+    async def _async_send(self, number, text):
+        for attempt in range(self._retries + 1):
+            wait = self._next_send - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            # Anything but an UNSENT_ERRORS error may follow a send that went through, so it is not retried
+            try:
+                await self._session.async_call(self._session.client.send_sms, number, text, retry=False)
+            except Exception as err:
+                if attempt == self._retries or not isinstance(err, UNSENT_ERRORS):
+                    self._next_send = time.monotonic() + self._interval
+                    raise
+                self._next_send = time.monotonic() + self._interval * (attempt + 1)
+            else:
+                self._next_send = time.monotonic() + self._interval
+                return
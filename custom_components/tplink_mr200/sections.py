@@ -0,0 +1,64 @@
+from collections import namedtuple
+
+from .const import CONF_FAST_INTERVAL, CONF_UPDATE_INTERVAL, CONF_SLOW_INTERVAL
+from .mr200 import Act, ACT_GET, ACT_GL
+
+Section = namedtuple("Section", ["tier", "type", "oid", "stack", "pstack"], defaults=["0,0,0,0,0,0", "0,0,0,0,0,0"])
+
+SECTIONS = {
+    "lte_link": Section(CONF_UPDATE_INTERVAL, ACT_GET, "WAN_LTE_LINK_CFG", "2,1,0,0,0,0"),
+    "lte_intf": Section(CONF_FAST_INTERVAL, ACT_GET, "WAN_LTE_INTF_CFG", "2,0,0,0,0,0"),
+    "lte_wan": Section(CONF_SLOW_INTERVAL, ACT_GET, "LTE_WAN_CFG", "2,1,0,0,0,0"),
+    "wan_common": Section(CONF_SLOW_INTERVAL, ACT_GET, "WAN_COMMON_INTF_CFG", "2,0,0,0,0,0"),
+    "clients": Section(CONF_UPDATE_INTERVAL, ACT_GL, "LAN_HOST_ENTRY"),
+    "sms": Section(CONF_UPDATE_INTERVAL, ACT_GET, "LTE_SMS_RECVMSGBOX"),
+    "sms_unread": Section(CONF_UPDATE_INTERVAL, ACT_GET, "LTE_NET_STATUS", "2,1,0,0,0,0"),
+    "wlan": Section(CONF_UPDATE_INTERVAL, ACT_GL, "LAN_WLAN"),
+    "wlan_guest": Section(CONF_UPDATE_INTERVAL, ACT_GL, "LAN_WLAN_MSSIDENTRY", pstack="1,0,0,0,0,0"),
+    "device_info": Section(CONF_SLOW_INTERVAL, ACT_GET, "IGD_DEV_INFO"),
+    "wan_ip_conn": Section(CONF_SLOW_INTERVAL, ACT_GET, "WAN_IP_CONN", "2,1,1,0,0,0"),
+}
+
+CONSUMERS = {
+    "device_info": {
+        "device_info": ("manufacturer", "modelName", "hardwareVersion", "softwareVersion"),
+        "wan_ip_conn": ("MACAddress",),
+    },
+    "lte_signal_level": {"lte_link": ("signalStrength",)},
+    "lte_enabled": {"lte_link": ("enable",)},
+    "lte_network_type": {"lte_link": ("networkType",)},
+    "lte_network_type_info": {"lte_link": ("networkType",)},
+    "lte_sim_status": {"lte_link": ("simStatus",)},
+    "lte_sim_status_info": {"lte_link": ("simStatus",)},
+    "lte_connect_status": {"lte_link": ("connectStatus",)},
+    "lte_current_rx_speed": {"lte_intf": ("curRxSpeed",)},
+    "lte_current_tx_speed": {"lte_intf": ("curTxSpeed",)},
+    "lte_total_statistics": {"lte_intf": ("totalStatistics",)},
+    "usage": {"lte_intf": ("totalStatistics",)},
+    "lte_isp_name": {"lte_wan": ("profileName",)},
+    "connection_type": {"wan_common": ("WANAccessType",)},
+    "total_clients": {"clients": ("MACAddress",)},
+    "client_trackers": {"clients": ("IPAddress", "MACAddress", "hostName")},
+    "unread_sms": {"sms_unread": ("smsUnreadCount",)},
+    "sms_events": {"sms": ("totalNumber",)},
+    "wan_events": {"lte_link": ("connectStatus",)},
+    "network_type_events": {"lte_link": ("networkType",)},
+    "sim_status_events": {"lte_link": ("simStatus",)},
+    "client_events": {"clients": ("IPAddress", "MACAddress", "hostName")},
+    "unread_sms_events": {"sms_unread": ("smsUnreadCount",)},
+    "wifi_2_4ghz": {"wlan": ("enable",)},
+    "wifi_5ghz": {"wlan": ("enable",)},
+    "guest_2_4ghz": {"wlan_guest": ("enable",)},
+    "guest_5ghz": {"wlan_guest": ("enable",)},
+}
+
+def build_plan(consumers):
+    attrs = {}
+    for consumer in consumers:
+        for name, section_attrs in CONSUMERS[consumer].items():
+            attrs.setdefault(name, {}).update(dict.fromkeys(section_attrs))
+    return {
+        name: Act(section.type, section.oid, section.stack, section.pstack, tuple(attrs[name]))
+        for name, section in SECTIONS.items()
+        if name in attrs
+    }
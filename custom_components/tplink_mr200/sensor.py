@@ -1,24 +1,98 @@
-from datetime import timedelta
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
+from time import monotonic
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.sensor import (
     SensorEntity,
+    SensorEntityDescription,
     SensorDeviceClass,
     SensorStateClass,
 )
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.const import EntityCategory, UnitOfTime, PERCENTAGE
 
-from .const import DOMAIN, UPDATE_INTERVAL
+from .const import DOMAIN
+from .throughput import WINDOWS
+from .filters import SensorFilter, sensor_filter
 
 _LOGGER = logging.getLogger(__name__)
 
+@dataclass(frozen=True, kw_only=True)
+class MR200SensorEntityDescription(SensorEntityDescription):
+    field: str | None = None
+    value_fn: Callable | None = None
+    last_reset_fn: Callable | None = None
+    usage: bool = False
+
+SENSORS = (
+    MR200SensorEntityDescription(key="connection_type", name="TP-Link MR200 Connection Type", icon="mdi:wan"),
+    MR200SensorEntityDescription(key="total_clients", name="TP-Link MR200 Total Clients", icon="mdi:account-multiple",
+                                 state_class=SensorStateClass.MEASUREMENT),
+    MR200SensorEntityDescription(key="unread_sms", name="TP-Link MR200 Unread SMS", icon="mdi:sim-outline",
+                                 state_class=SensorStateClass.TOTAL),
+    MR200SensorEntityDescription(key="lte_signal_level", name="TP-Link MR200 LTE Signal Level", icon="mdi:sim-outline",
+                                 native_unit_of_measurement=PERCENTAGE, state_class=SensorStateClass.MEASUREMENT),
+    MR200SensorEntityDescription(key="lte_enabled", name="TP-Link MR200 LTE Enabled", icon="mdi:sim-outline"),
+    MR200SensorEntityDescription(key="lte_isp_name", name="TP-Link MR200 LTE ISP Name", icon="mdi:sim-outline"),
+    MR200SensorEntityDescription(key="lte_network_type_info", name="TP-Link MR200 LTE Network Type Info", icon="mdi:sim-outline"),
+    MR200SensorEntityDescription(key="lte_network_type", name="TP-Link MR200 LTE Network Type", icon="mdi:sim-outline"),
+    MR200SensorEntityDescription(key="lte_sim_status_info", name="TP-Link MR200 LTE SIM Status Info", icon="mdi:sim-outline"),
+    MR200SensorEntityDescription(key="lte_sim_status", name="TP-Link MR200 LTE SIM Status", icon="mdi:sim-outline"),
+    MR200SensorEntityDescription(key="lte_connect_status", name="TP-Link MR200 LTE Connection Status", icon="mdi:sim-outline"),
+    MR200SensorEntityDescription(key="lte_current_rx_speed", name="TP-Link MR200 LTE Current RX Speed", icon="mdi:sim-outline",
+                                 native_unit_of_measurement="B/s", device_class=SensorDeviceClass.DATA_RATE,
+                                 state_class=SensorStateClass.MEASUREMENT),
+    MR200SensorEntityDescription(key="lte_current_tx_speed", name="TP-Link MR200 LTE Current TX Speed", icon="mdi:sim-outline",
+                                 native_unit_of_measurement="B/s", device_class=SensorDeviceClass.DATA_RATE,
+                                 state_class=SensorStateClass.MEASUREMENT),
+    MR200SensorEntityDescription(key="lte_total_statistics", name="TP-Link MR200 LTE Total Statistics", icon="mdi:sim-outline",
+                                 native_unit_of_measurement="B", device_class=SensorDeviceClass.DATA_SIZE,
+                                 state_class=SensorStateClass.TOTAL),
+    MR200SensorEntityDescription(key="lte_usage_today", name="TP-Link MR200 LTE Usage Today", icon="mdi:sim-outline",
+                                 native_unit_of_measurement="B", device_class=SensorDeviceClass.DATA_SIZE,
+                                 state_class=SensorStateClass.TOTAL, field="lte_total_statistics", usage=True,
+                                 value_fn=lambda coordinator: coordinator.usage.period("today"),
+                                 last_reset_fn=lambda coordinator: coordinator.usage.period_start("today")),
+    MR200SensorEntityDescription(key="lte_usage_billing_cycle", name="TP-Link MR200 LTE Usage Billing Cycle", icon="mdi:sim-outline",
+                                 native_unit_of_measurement="B", device_class=SensorDeviceClass.DATA_SIZE,
+                                 state_class=SensorStateClass.TOTAL, field="lte_total_statistics", usage=True,
+                                 value_fn=lambda coordinator: coordinator.usage.period("billing_cycle"),
+                                 last_reset_fn=lambda coordinator: coordinator.usage.period_start("billing_cycle")),
+    MR200SensorEntityDescription(key="lte_usage_30d", name="TP-Link MR200 LTE Usage 30 Days", icon="mdi:sim-outline",
+                                 native_unit_of_measurement="B", device_class=SensorDeviceClass.DATA_SIZE,
+                                 state_class=SensorStateClass.MEASUREMENT, field="lte_total_statistics", usage=True,
+                                 value_fn=lambda coordinator: coordinator.usage.rolling),
+)
+
+DIAGNOSTIC_SENSORS = (
+    MR200SensorEntityDescription(key="last_poll_duration", name="TP-Link MR200 Last Poll Duration", icon="mdi:timer-outline",
+                                 native_unit_of_measurement=UnitOfTime.SECONDS, state_class=SensorStateClass.MEASUREMENT,
+                                 entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False,
+                                 value_fn=lambda coordinator: round(coordinator.session.client.metrics.get("poll").last or 0, 3)),
+    MR200SensorEntityDescription(key="login_count", name="TP-Link MR200 Login Count", icon="mdi:timer-outline",
+                                 state_class=SensorStateClass.TOTAL_INCREASING,
+                                 entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False,
+                                 value_fn=lambda coordinator: coordinator.session.client.metrics.get("login").count),
+    MR200SensorEntityDescription(key="poll_error_rate", name="TP-Link MR200 Poll Error Rate", icon="mdi:timer-outline",
+                                 native_unit_of_measurement=PERCENTAGE, state_class=SensorStateClass.MEASUREMENT,
+                                 entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False,
+                                 value_fn=lambda coordinator: round(coordinator.session.client.metrics.get("poll").error_rate * 100, 1)),
+)
+
+def throughput_description(direction, window):
+    return MR200SensorEntityDescription(
+        key=f"lte_{direction}_speed_{window}m",
+        name=f"TP-Link MR200 LTE {direction.upper()} Speed {window} min",
+        icon="mdi:sim-outline",
+        native_unit_of_measurement="B/s",
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+    )
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -27,71 +101,107 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
 
     entities = [
-        Sensor(coordinator, "connection_type", "TP-Link MR200 Connection Type", None),
-        Sensor(coordinator, "total_clients", "TP-Link MR200 Total Clients", None),
-        Sensor(coordinator, "unread_sms", "TP-Link MR200 Unread SMS", None, "total"),
-        Sensor(coordinator, "lte_signal_level", "TP-Link MR200 LTE Signal Level", "%"),
-        Sensor(coordinator, "lte_enabled", "TP-Link MR200 LTE Enabled", None),
-        Sensor(coordinator, "lte_isp_name", "TP-Link MR200 LTE ISP Name", None),
-        Sensor(coordinator, "lte_network_type_info", "TP-Link MR200 LTE Network Type Info", None),
-        Sensor(coordinator, "lte_network_type", "TP-Link MR200 LTE Network Type", None),
-        Sensor(coordinator, "lte_sim_status_info", "TP-Link MR200 LTE SIM Status Info", None),
-        Sensor(coordinator, "lte_sim_status", "TP-Link MR200 LTE SIM Status", None),
-        Sensor(coordinator, "lte_connect_status", "TP-Link MR200 LTE Connection Status", None),
-        Sensor(coordinator, "lte_current_rx_speed", "TP-Link MR200 LTE Current RX Speed", "B/s"),
-        Sensor(coordinator, "lte_current_tx_speed", "TP-Link MR200 LTE Current TX Speed", "B/s"),
-        Sensor(coordinator, "lte_total_statistics", "TP-Link MR200 LTE Total Statistics", "B", "total"),
+        Sensor(coordinator, description, sensor_filter(config_entry.options, description.key))
+        for description in SENSORS
     ]
+    entities += [DiagnosticSensor(coordinator, description) for description in DIAGNOSTIC_SENSORS]
+
+    sampler = hass.data[DOMAIN][config_entry.entry_id]["sampler"]
+    if sampler is not None:
+        for direction in ("rx", "tx"):
+            for window in WINDOWS:
+                entities.append(ThroughputSensor(coordinator, throughput_description(direction, window), sampler, direction, window))
     
     async_add_entities(entities)
 
 class Sensor(CoordinatorEntity, SensorEntity):
-    def __init__(self, coordinator, key, name, unit, state_class=None):
+    entity_description: MR200SensorEntityDescription
+
+    def __init__(self, coordinator, description: MR200SensorEntityDescription, value_filter: SensorFilter | None = None):
         super().__init__(coordinator)
-        device_info = coordinator.data.get("device_info", {})
-        device_name0 = device_info.get("manufacturer", "").lower().replace(" ", "_").replace("-", "_")
-        device_name1 = device_info.get("model", "").lower().replace("archer","").replace(" ", "_")
-        device_name = device_name0 + "_" + device_name1
-        self._key = key
-        self._attr_name = name
-        self._attr_native_unit_of_measurement = unit
-        self._attr_unique_id = f"{device_name}_{key}"
-        self.entity_id = f"sensor.{device_name}_{key}"
-
-        if state_class:
-            self._attr_state_class = state_class
-        elif key in ["lte_current_rx_speed", "lte_current_tx_speed", "lte_signal_level", "total_clients", "unread_sms"]:
-            self._attr_state_class = SensorStateClass.MEASUREMENT
-
-        if key in ["lte_current_rx_speed", "lte_current_tx_speed"]:
-            self._attr_device_class = SensorDeviceClass.DATA_RATE
-        elif key == "lte_total_statistics":
-            self._attr_device_class = SensorDeviceClass.DATA_SIZE
-
-        if "lte" in key:
-            self._attr_icon = "mdi:sim-outline"
-        if "sms" in key:
-            self._attr_icon = "mdi:sim-outline"
-        if "clients" in key:
-            self._attr_icon = "mdi:account-multiple"
-        if "connection_type" in key:
-            self._attr_icon = "mdi:wan"
+        slug = coordinator.device.slug
+        self.entity_description = description
+        self._field = description.field or description.key
+        self._filter = value_filter
+        self._last_available = None
+        self._written_value = self._value() if value_filter else None
+        self._written_at = monotonic()
+        self._attr_unique_id = f"{slug}_{description.key}"
+        self.entity_id = f"sensor.{slug}_{description.key}"
+        coordinator.async_register_consumer("sensor", self._attr_unique_id, self._field)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self.entity_description.usage:
+            self.async_on_remove(self.coordinator.usage.async_add_listener(self.async_write_ha_state))
 
     @property
     def device_info(self):
-        device_info = self.coordinator.data.get("device_info", {})
-        mac = device_info.get("mac_address")
-        return {
-            "identifiers": {(DOMAIN, mac)},
-            "connections": {(dr.CONNECTION_NETWORK_MAC, mac)},
-            "name": "TP-Link MR200",
-            "manufacturer": device_info.get("manufacturer"),
-            "model": device_info.get("model"),
-            "hw_version": device_info.get("hw_version"),
-            "sw_version": device_info.get("sw_version"),
-            "configuration_url": device_info.get("device_url", "https://example.com")
-        }
+        return self.coordinator.device.info
+
+    def _should_write(self):
+        if self._filter is None:
+            return self._field in self.coordinator.changed
+        value = self._value()
+        if value == self._written_value:
+            return False
+        return self._filter.accept(self._written_value, value, monotonic() - self._written_at)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        available = self.available
+        if available != self._last_available or self._should_write():
+            self._last_available = available
+            if self._filter:
+                self._written_value = self._value()
+                self._written_at = monotonic()
+            self.async_write_ha_state()
+
+    @property
+    def last_reset(self):
+        if self.entity_description.last_reset_fn:
+            return self.entity_description.last_reset_fn(self.coordinator)
+        return None
+
+    def _value(self):
+        if self.entity_description.value_fn:
+            return self.entity_description.value_fn(self.coordinator)
+        return getattr(self.coordinator.data, self._field)
 
     @property
     def native_value(self):
-        return self.coordinator.data.get(self._key, 0)
\ No newline at end of file
+        if self._filter:
+            return self._written_value
+        return self._value()
+
+class ThroughputSensor(Sensor):
+    _unrecorded_attributes = frozenset({"min", "max", "p95"})
+
+    def __init__(self, coordinator, description, sampler, direction, window):
+        super().__init__(coordinator, description)
+        self._sampler = sampler
+        self._direction = direction
+        self._window = window
+        self._stats = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._stats = self._sampler.stats(self._direction, self._window)
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self):
+        return self._stats["mean"] if self._stats else None
+
+    @property
+    def extra_state_attributes(self):
+        return self._stats
+
+class DiagnosticSensor(Sensor):
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        return True
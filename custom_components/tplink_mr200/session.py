@@ -0,0 +1,45 @@
+import asyncio
+import logging
+
+import aiohttp
+
+from .mr200 import MR200Client, NotLoggedInException, RequestRejectedException, ConnectionFailedException
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors that prove a call never reached the router, so even a non-idempotent one can be sent again
+UNSENT_ERRORS = (ConnectionFailedException, RequestRejectedException, aiohttp.ClientConnectorError)
+
+class MR200Session:
+    def __init__(self, client: MR200Client, username, password):
+        self._client = client
+        self._username = username
+        self._password = password
+        self._lock = asyncio.Lock()
+
+    @property
+    def client(self) -> MR200Client:
+        return self._client
+
+    async def _async_login(self):
+        await self._client.login(self._username, self._password)
+
+    async def async_call(self, method, *args, timeout=None, retry=True):
+        async with self._lock:
+            async with asyncio.timeout(timeout):
+                if not self._client.logged_in:
+                    await self._async_login()
+                try:
+                    return await method(*args)
+                except NotLoggedInException as err:
+                    # Unless the router refused it outright, a non-idempotent call (SMS, reboot)
+                    # may already have run, so leave resending it to the caller
+                    if not retry and not isinstance(err, RequestRejectedException):
+                        raise
+                    _LOGGER.debug("Session on %s expired, logging in again", self._client.router_ip)
+                    await self._async_login()
+                    return await method(*args)
+
+    async def async_logout(self):
+        async with self._lock:
+            await self._client.logout()
@@ -0,0 +1,99 @@
+import logging
+
+from homeassistant.core import HomeAssistant
+
+from .const import EVENT_SMS_RECEIVED
+from .mr200 import Act, ACT_GET, ACT_SET, ACT_GL
+from .session import MR200Session
+
+_LOGGER = logging.getLogger(__name__)
+
+PAGE_SIZE = 8
+
+def _page_acts(page):
+    return [
+        Act(ACT_SET, "LTE_SMS_RECVMSGBOX", attrs=(f"PageNumber={page}",)),
+        Act(ACT_GL, "LTE_SMS_RECVMSGENTRY", attrs=("index", "receivedTime")),
+    ]
+
+def _position(message):
+    return (message.get("receivedTime", ""), int(message.get("index", "0") or 0))
+
+def _last_page(total):
+    return max((total or 0) + PAGE_SIZE - 1, PAGE_SIZE) // PAGE_SIZE
+
+class SmsInbox:
+    def __init__(self, hass: HomeAssistant, entry_id, host):
+        self._hass = hass
+        self._entry_id = entry_id
+        self._host = host
+        self.total = None
+        self.high_water_mark = None
+
+    @property
+    def listing_page(self):
+        return _last_page(self.total)
+
+    def listing_acts(self):
+        # Listed alongside the header in the batched poll, so an unchanged inbox costs no extra request
+        return _page_acts(self.listing_page)
+
+    def as_dict(self):
+        return {"total": self.total, "high_water_mark": self.high_water_mark}
+
+    def restore(self, stored):
+        mark = stored.get("high_water_mark")
+        self.total = stored.get("total")
+        self.high_water_mark = (str(mark[0]), int(mark[1])) if mark else None
+
+    def _is_fresh(self, entry):
+        return self.high_water_mark is None or _position(entry) > self.high_water_mark
+
+    async def async_sync(self, session: MR200Session, total, listing=None):
+        if total == 0:
+            self.total = total
+            return
+
+        # The inbox is listed oldest first, so new messages land on the last pages. Walk back from
+        # the last page until one holds nothing new; a message that arrived alongside a deletion
+        # leaves the total unchanged but still shows up on the last page.
+        read_sections = session.client.read_sections
+        seeding = self.high_water_mark is None
+        inbox = []
+        for page in range(_last_page(total), 0, -1):
+            if listing is not None and listing[0] == page:
+                entries = listing[1]
+            else:
+                _, entries = await session.async_call(read_sections, _page_acts(page))
+            inbox.extend((page, entry) for entry in entries)
+            if seeding or not any(self._is_fresh(entry) for entry in entries):
+                break
+
+        received = []
+        if not seeding:
+            new_entries = [(page, entry) for page, entry in inbox if self._is_fresh(entry)]
+            for page in sorted({page for page, _ in new_entries}):
+                entries = [entry for entry_page, entry in new_entries if entry_page == page]
+                acts = [Act(ACT_SET, "LTE_SMS_RECVMSGBOX", attrs=(f"PageNumber={page}",))] + [
+                    Act(ACT_GET, "LTE_SMS_RECVMSGENTRY", f"{entry['idx']},0,0,0,0,0", attrs=("from", "content", "receivedTime"))
+                    for entry in entries
+                ]
+                messages = (await session.async_call(read_sections, acts))[1:]
+                received.extend(zip(entries, messages))
+
+        positions = [_position(entry) for _, entry in inbox]
+        if self.high_water_mark is not None:
+            positions.append(self.high_water_mark)
+        if positions:
+            self.high_water_mark = max(positions)
+        self.total = total
+
+        for entry, message in sorted(received, key=lambda pair: _position(pair[0])):
+            self._hass.bus.async_fire(EVENT_SMS_RECEIVED, {
+                "entry_id": self._entry_id,
+                "host": self._host,
+                "index": entry.get("index"),
+                "from": message.get("from"),
+                "content": message.get("content"),
+                "received_time": message.get("receivedTime", entry.get("receivedTime")),
+            })
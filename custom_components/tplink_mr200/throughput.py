@@ -0,0 +1,92 @@
+import logging
+import math
+import time
+from array import array
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .sections import build_plan
+from .session import MR200Session
+
+_LOGGER = logging.getLogger(__name__)
+
+WINDOWS = (1, 5, 15)
+
+SAMPLE_ACTS = list(build_plan(["lte_current_rx_speed", "lte_current_tx_speed"]).values())
+
+class RingBuffer:
+    def __init__(self, size):
+        self._size = size
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        self._pos = 0
+        self._count = 0
+
+    def append(self, timestamp, value):
+        self._times[self._pos] = timestamp
+        self._values[self._pos] = value
+        self._pos = (self._pos + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+
+    def since(self, timestamp):
+        values = []
+        pos = self._pos
+        for _ in range(self._count):
+            pos = (pos - 1) % self._size
+            if self._times[pos] < timestamp:
+                break
+            values.append(self._values[pos])
+        return values
+
+def window_stats(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        "min": ordered[0],
+        "max": ordered[-1],
+        "mean": round(sum(ordered) / len(ordered), 1),
+        "p95": ordered[max(math.ceil(len(ordered) * 0.95) - 1, 0)],
+    }
+
+class ThroughputSampler:
+    def __init__(self, hass: HomeAssistant, session: MR200Session, interval, is_enabled):
+        self._hass = hass
+        self._session = session
+        self._interval = interval
+        self._is_enabled = is_enabled
+        self._busy = False
+        self._unsub = None
+        size = math.ceil(max(WINDOWS) * 60 / interval) + 1
+        self.buffers = {"rx": RingBuffer(size), "tx": RingBuffer(size)}
+
+    @callback
+    def async_start(self):
+        self._unsub = async_track_time_interval(
+            self._hass, self._async_sample, timedelta(seconds=self._interval)
+        )
+
+    @callback
+    def async_stop(self):
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    async def _async_sample(self, now):
+        if self._busy or not self._is_enabled():
+            return
+        self._busy = True
+        try:
+            (intf,) = await self._session.async_call(self._session.client.read_sections, SAMPLE_ACTS)
+            timestamp = time.monotonic()
+            self.buffers["rx"].append(timestamp, int(intf.get("curRxSpeed", "0")))
+            self.buffers["tx"].append(timestamp, int(intf.get("curTxSpeed", "0")))
+        except Exception as err:
+            _LOGGER.debug("Throughput sample failed: %s", err)
+        finally:
+            self._busy = False
+
+    def stats(self, direction, window):
+        return window_stats(self.buffers[direction].since(time.monotonic() - window * 60))
@@ -0,0 +1,165 @@
+import base64
+import calendar
+from array import array
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.util.dt import now as dt_now
+
+from .const import DOMAIN, BILLING_DAY
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 300
+# Quarter hours divide every UTC offset, so no bucket straddles a local midnight
+BUCKET_SECONDS = 900
+ROLLING_DAYS = 30
+RETENTION_DAYS = 62
+
+def _day_start(now: datetime) -> datetime:
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def billing_cycle_start(now: datetime, billing_day) -> datetime:
+    year, month = now.year, now.month
+    if now.day < min(billing_day, calendar.monthrange(year, month)[1]):
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    day = min(billing_day, calendar.monthrange(year, month)[1])
+    return _day_start(now).replace(year=year, month=month, day=day)
+
+class UsageCounter:
+    def __init__(self, hass: HomeAssistant, entry_id, billing_day=BILLING_DAY):
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.usage")
+        self._billing_day = billing_day
+        self._times = array("q")
+        self._values = array("d")
+        self._last_total = None
+        self._rolling_start = 0
+        self._rolling = 0.0
+        self._periods = {}
+        self._listeners = []
+        self._unsub = None
+
+    async def async_load(self):
+        stored = await self._store.async_load()
+        if stored:
+            self._last_total = stored.get("last_total")
+            self._times.frombytes(base64.b64decode(stored.get("times", "")))
+            self._values.frombytes(base64.b64decode(stored.get("values", "")))
+        self._recompute(dt_now())
+
+    async def async_flush(self):
+        await self._store.async_save(self._stored_state())
+
+    async def async_remove(self):
+        await self._store.async_remove()
+
+    @callback
+    def async_start(self):
+        self._unsub = async_track_time_change(self._hass, self._async_rollover, minute=0, second=0)
+
+    @callback
+    def async_stop(self):
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def async_add_listener(self, update_callback):
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    @callback
+    def _async_rollover(self, now):
+        self._refresh(dt_now())
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def _stored_state(self):
+        return {
+            "last_total": self._last_total,
+            "times": base64.b64encode(self._times.tobytes()).decode("ascii"),
+            "values": base64.b64encode(self._values.tobytes()).decode("ascii"),
+        }
+
+    def _period_starts(self, now):
+        return {
+            "today": _day_start(now),
+            "billing_cycle": billing_cycle_start(now, self._billing_day),
+        }
+
+    def _sum_since(self, timestamp):
+        total = 0.0
+        for i in range(len(self._times) - 1, -1, -1):
+            if self._times[i] < timestamp:
+                break
+            total += self._values[i]
+        return total
+
+    def _recompute(self, now):
+        self._rolling_start = 0
+        self._rolling = 0.0
+        self._periods = {}
+        self._expire(now)
+        self._rolling = sum(self._values[self._rolling_start:])
+        self._refresh(now)
+
+    def _refresh(self, now):
+        self._expire(now)
+        for name, start in self._period_starts(now).items():
+            if name not in self._periods or self._periods[name][0] != start:
+                self._periods[name] = (start, self._sum_since(start.timestamp()))
+
+    def _expire(self, now):
+        horizon = now.timestamp() - ROLLING_DAYS * 86400
+        while self._rolling_start < len(self._times) and self._times[self._rolling_start] < horizon:
+            self._rolling -= self._values[self._rolling_start]
+            self._rolling_start += 1
+
+        retention = now.timestamp() - RETENTION_DAYS * 86400
+        if self._times and self._times[0] < retention and self._rolling_start > len(self._times) // 2:
+            keep = next((i for i, ts in enumerate(self._times) if ts >= retention), len(self._times))
+            del self._times[:keep]
+            del self._values[:keep]
+            self._rolling_start -= keep
+
+    @property
+    def rolling(self):
+        self._expire(dt_now())
+        return self._rolling
+
+    def period(self, name):
+        self._refresh(dt_now())
+        return self._periods[name][1] if name in self._periods else None
+
+    def period_start(self, name):
+        self._refresh(dt_now())
+        return self._periods[name][0] if name in self._periods else None
+
+    @callback
+    def async_add_total(self, total):
+        if total is None:
+            return
+        now = dt_now()
+        previous, self._last_total = self._last_total, total
+        if previous is None:
+            self._store.async_delay_save(self._stored_state, SAVE_DELAY)
+            return
+        delta = total - previous if total >= previous else total
+
+        bucket = int(now.timestamp()) // BUCKET_SECONDS * BUCKET_SECONDS
+        if self._times and self._times[-1] == bucket:
+            self._values[-1] += delta
+        else:
+            self._times.append(bucket)
+            self._values.append(delta)
+
+        self._rolling += delta
+        for name, start in self._period_starts(now).items():
+            current_start, current = self._periods.get(name, (None, 0.0))
+            if current_start == start:
+                self._periods[name] = (start, current + delta)
+        self._refresh(now)
+        self._store.async_delay_save(self._stored_state, SAVE_DELAY)
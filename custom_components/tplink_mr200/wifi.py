@@ -0,0 +1,63 @@
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .mr200 import wifi_act
+
+_LOGGER = logging.getLogger(__name__)
+
+WRITE_DELAY = 0.25
+
+WIFI_NETWORKS = {
+    "wifi_2_4ghz": (1, False),
+    "wifi_5ghz": (2, False),
+    "guest_2_4ghz": (1, True),
+    "guest_5ghz": (2, True),
+}
+
+class WifiWriter:
+    def __init__(self, hass: HomeAssistant, coordinator):
+        self._hass = hass
+        self._coordinator = coordinator
+        self.pending = {}
+        self.optimistic = {}
+        self._unsub = None
+
+    @callback
+    def async_set(self, key, enabled):
+        self.pending[key] = enabled
+        if self._unsub is None:
+            self._unsub = async_call_later(self._hass, WRITE_DELAY, self._async_flush)
+
+    def state(self, key):
+        if key in self.pending:
+            return self.pending[key]
+        if key in self.optimistic:
+            enabled, written_at = self.optimistic[key]
+            # Held until a poll reads the section back after the write went through
+            section = "wlan_guest" if WIFI_NETWORKS[key][1] else "wlan"
+            if (self._coordinator.fetched_at(section) or 0) <= written_at:
+                return enabled
+            del self.optimistic[key]
+        return None
+
+    @callback
+    def async_cancel(self):
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    async def _async_flush(self, _now):
+        self._unsub = None
+        pending, self.pending = self.pending, {}
+        acts = [wifi_act(WIFI_NETWORKS[key][0], enabled, WIFI_NETWORKS[key][1]) for key, enabled in pending.items()]
+        session = self._coordinator.session
+        try:
+            await session.async_call(session.client.write_sections, acts)
+            written_at = time.monotonic()
+            self.optimistic.update((key, (enabled, written_at)) for key, enabled in pending.items())
+        except Exception as err:
+            _LOGGER.error("Error changing WiFi state: %s", err)
+        self._coordinator.async_refresh_sections("wlan", "wlan_guest")
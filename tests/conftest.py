@@ -0,0 +1,58 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+def load_fixture(name):
+    return (FIXTURES / name).read_bytes()
+
+async def wait_for_polls(hass):
+    from custom_components.tplink_mr200.fleet import async_get_scheduler
+
+    await hass.async_block_till_done()
+    while tasks := list(async_get_scheduler(hass)._in_flight.values()):
+        await asyncio.gather(*tasks)
+    await hass.async_block_till_done()
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self, *args, **kwargs):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+@pytest.fixture
+async def fake_router():
+    from aiohttp.test_utils import TestServer
+
+    from .emulator import FakeMR200
+
+    router = FakeMR200()
+    server = TestServer(router.app)
+    await server.start_server()
+    router.host = f"{server.host}:{server.port}"
+    yield router
+    await server.close()
+
+@pytest.fixture
+async def http_session():
+    import aiohttp
+
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+@pytest.fixture
+async def hass(tmp_path):
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import entity_registry as er
+
+    hass = HomeAssistant(str(tmp_path))
+    await er.async_load(hass)
+    yield hass
+    await hass.async_stop(force=True)
@@ -0,0 +1,181 @@
+import asyncio
+import base64
+import binascii
+import json
+import re
+import secrets
+
+import rsa
+from aiohttp import web
+
+from custom_components.tplink_mr200.mr200 import ACT_GET, ACT_SET, ACT_GL, ACT_OP, ACT_CGI
+from custom_components.tplink_mr200.sms import PAGE_SIZE
+
+from .conftest import FIXTURES
+
+_ACT_RE = re.compile(r"\[(.+?)#(.+?)#(.+?)\](\d+),(\d+)$")
+
+INDEX_PADDING = "<!-- " + "x" * 200_000 + " -->\n"
+
+class FakeMR200:
+    """In-process MR200 web interface speaking the getParm/login/token/cgi protocol."""
+
+    def __init__(self, username="admin", password="admin", latency=0.0):
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.state = json.loads((FIXTURES / "router_state.json").read_text())
+        self.sent_sms = []
+        self.requests = 0
+        self.logins = 0
+        self._public_key, self._private_key = rsa.newkeys(512)
+        self._sessions = {}
+        self._pending_error = None
+        self._sms_page = 1
+
+        self.app = web.Application()
+        self.app.router.add_get("/cgi/getParm", self._get_parm)
+        self.app.router.add_post("/cgi/login", self._login)
+        self.app.router.add_get("/", self._index)
+        self.app.router.add_post("/cgi", self._cgi)
+
+    def expire_sessions(self):
+        self._sessions.clear()
+
+    def fail_next(self, code):
+        self._pending_error = code
+
+    async def _delay(self):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def receive_sms(self, sender, content, received_time):
+        inbox = self.state["LTE_SMS_RECVMSGENTRY"]
+        index = max((int(values["index"]) for _, values in inbox), default=0) + 1
+        inbox.append([f"{len(inbox) + 1},0,0,0,0,0", {
+            "index": str(index), "from": sender, "content": content, "receivedTime": received_time, "unread": "1",
+        }])
+        self._sync_sms_total()
+
+    def delete_sms(self, index):
+        inbox = self.state["LTE_SMS_RECVMSGENTRY"]
+        inbox[:] = [entry for entry in inbox if entry[1]["index"] != str(index)]
+        self._sync_sms_total()
+
+    def _sync_sms_total(self):
+        self.state["LTE_SMS_RECVMSGBOX"][0][1]["totalNumber"] = str(len(self.state["LTE_SMS_RECVMSGENTRY"]))
+
+    def _sms_entries(self):
+        start = (self._sms_page - 1) * PAGE_SIZE
+        page = self.state["LTE_SMS_RECVMSGENTRY"][start:start + PAGE_SIZE]
+        return [(f"{i},0,0,0,0,0", values) for i, (_, values) in enumerate(page, start=1)]
+
+    def _entries(self, oid):
+        if oid == "LTE_SMS_RECVMSGENTRY":
+            return self._sms_entries()
+        return self.state.get(oid, [])
+
+    def _session_token(self, request):
+        return self._sessions.get(request.cookies.get("JSESSIONID"))
+
+    async def _get_parm(self, request):
+        await self._delay()
+        return web.Response(text=(
+            f'var ee="{self._public_key.e:x}";\n'
+            f'var nn="{self._public_key.n:x}";\n'
+            'var seq="123456";\n'
+            "$.ret=0;\n"
+        ))
+
+    def _decrypt(self, value):
+        return rsa.decrypt(binascii.unhexlify(value), self._private_key).decode("utf8")
+
+    async def _login(self, request):
+        await self._delay()
+        try:
+            username = self._decrypt(request.query["UserName"])
+            password = base64.b64decode(self._decrypt(request.query["Passwd"])).decode("utf8")
+        except (KeyError, ValueError, rsa.DecryptionError):
+            return web.Response(text="$.ret=1;\n")
+        if (username, password) != (self.username, self.password):
+            return web.Response(text="$.ret=71233;\n")
+        self.logins += 1
+        session_id = secrets.token_hex(16)
+        self._sessions[session_id] = secrets.token_hex(16)
+        response = web.Response(text="$.ret=0;\n")
+        response.set_cookie("JSESSIONID", session_id)
+        return response
+
+    async def _index(self, request):
+        await self._delay()
+        token = self._session_token(request)
+        script = f'<script type="text/javascript">var token="{token}";</script>\n' if token else ""
+        return web.Response(text=f"<html><head>{script}</head><body>\n{INDEX_PADDING}</body></html>\n")
+
+    async def _cgi(self, request):
+        await self._delay()
+        token = self._session_token(request)
+        if token is None or request.headers.get("TokenID") != token:
+            return web.Response(status=403, text="")
+
+        types = [int(act_type) for act_type in request.query_string.split("&") if act_type]
+        acts = [(act_type, *act) for act_type, act in zip(types, self._parse_acts(await request.text()))]
+        if self._pending_error is not None:
+            code, self._pending_error = self._pending_error, None
+            return web.Response(text=f"[error]{code}\n")
+
+        lines = []
+        for index, (act_type, oid, stack, attrs) in enumerate(acts):
+            if act_type == ACT_GET:
+                entry_stack, values = self._find(oid, stack)
+                lines.append(f"[{entry_stack}]{index}")
+                lines.extend(f"{key}={values[key]}" for key in (attrs or values) if key in values)
+            elif act_type == ACT_GL:
+                for entry_stack, values in self._entries(oid):
+                    lines.append(f"[{entry_stack}]{index}")
+                    lines.extend(f"{key}={values[key]}" for key in (attrs or values) if key in values)
+            elif act_type == ACT_SET:
+                self._set(oid, stack, attrs)
+                lines.append(f"[{stack}]{index}")
+            elif act_type == ACT_OP and oid == "ACT_REBOOT":
+                self.expire_sessions()
+                lines.append(f"[{stack}]{index}")
+            elif act_type == ACT_CGI and oid == "/cgi/logout":
+                self._sessions.pop(request.cookies.get("JSESSIONID"), None)
+        lines.append("[error]0")
+        return web.Response(text="\n".join(lines) + "\n")
+
+    @staticmethod
+    def _parse_acts(body):
+        acts = []
+        lines = body.split("\r\n")
+        i = 0
+        while i < len(lines):
+            match = _ACT_RE.match(lines[i])
+            i += 1
+            if match is None:
+                continue
+            count = int(match.group(5))
+            acts.append((match.group(1), match.group(2), lines[i:i + count]))
+            i += count
+        return acts
+
+    def _find(self, oid, stack):
+        entries = self._entries(oid)
+        for entry_stack, values in entries:
+            if entry_stack == stack:
+                return entry_stack, values
+        return (entries[0] if entries else (stack, {}))
+
+    def _set(self, oid, stack, attrs):
+        values = dict(attr.split("=", 1) for attr in attrs if "=" in attr)
+        if oid == "LTE_SMS_SENDNEWMSG":
+            self.sent_sms.append((values.get("to"), values.get("textContent")))
+            return
+        if oid == "LTE_SMS_RECVMSGBOX" and "PageNumber" in values:
+            self._sms_page = int(values["PageNumber"])
+            return
+        for entry_stack, entry in self.state.get(oid, []):
+            if entry_stack == stack:
+                entry.update(values)
@@ -0,0 +1,33 @@
+from custom_components.tplink_mr200.clients import ClientIndex
+
+def host(mac, ip, name=""):
+    return {"MACAddress": mac, "IPAddress": ip, "hostName": name}
+
+def test_first_update_reports_every_client_as_joined():
+    index = ClientIndex()
+    diff = index.update([host("aa:bb:cc:00:00:01", "192.168.1.10"), host("AA:BB:CC:00:00:02", "192.168.1.11")])
+    assert diff.joined == {"AA:BB:CC:00:00:01", "AA:BB:CC:00:00:02"}
+    assert diff.left == diff.changed == frozenset()
+
+def test_update_diffs_by_mac():
+    index = ClientIndex()
+    index.update([host("AA:BB:CC:00:00:01", "192.168.1.10"), host("AA:BB:CC:00:00:02", "192.168.1.11", "phone")])
+    diff = index.update([host("aa:bb:cc:00:00:02", "192.168.1.12", "phone"), host("AA:BB:CC:00:00:03", "192.168.1.13")])
+
+    assert diff.joined == {"AA:BB:CC:00:00:03"}
+    assert diff.left == {"AA:BB:CC:00:00:01"}
+    assert diff.changed == {"AA:BB:CC:00:00:02"}
+    assert index.previous["AA:BB:CC:00:00:01"] == ("192.168.1.10", "")
+    assert index.clients["AA:BB:CC:00:00:02"] == ("192.168.1.12", "phone")
+
+def test_unchanged_table_gives_an_empty_diff():
+    index = ClientIndex()
+    entries = [host("AA:BB:CC:00:00:01", "192.168.1.10")]
+    index.update(entries)
+    assert not any(index.update(entries))
+
+def test_entries_without_mac_are_ignored():
+    index = ClientIndex()
+    diff = index.update([host("", "192.168.1.10"), {"IPAddress": "192.168.1.11"}])
+    assert not any(diff)
+    assert index.clients == {}
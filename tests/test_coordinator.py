@@ -0,0 +1,75 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.tplink_mr200.const import DOMAIN, EVENT_CLIENT_JOINED
+from custom_components.tplink_mr200.coordinator import MR200Coordinator, STORAGE_VERSION, Store
+from custom_components.tplink_mr200.mr200 import MR200Client
+from custom_components.tplink_mr200.session import MR200Session
+
+from .conftest import wait_for_polls
+
+@pytest.fixture
+async def coordinator(hass, fake_router, http_session):
+    entry = SimpleNamespace(entry_id="entry", title="MR200", data={"host": fake_router.host}, options={})
+    session = MR200Session(MR200Client(fake_router.host, http_session), "admin", "admin")
+    coordinator = MR200Coordinator(hass, entry, session)
+    await coordinator.async_refresh()
+    return coordinator
+
+async def test_flush_writes_the_pending_save_before_removal(hass, coordinator, tmp_path):
+    path = tmp_path / ".storage" / f"{DOMAIN}.entry"
+    coordinator.store.async_delay_save(coordinator._stored_state, 60)
+
+    await coordinator.async_flush()
+    assert json.loads(path.read_text())["data"]["data"]["lte_isp_name"] == coordinator.data.lte_isp_name
+
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.entry").async_remove()
+    await hass.async_stop(force=True)
+    assert not path.exists()
+
+async def test_disabled_entities_leave_the_plan(hass, coordinator):
+    registry = er.async_get(hass)
+    for consumer in ("lte_isp_name", "lte_current_rx_speed", "lte_current_tx_speed"):
+        coordinator.async_register_consumer("sensor", f"mr200_{consumer}", consumer)
+        registry.async_get_or_create("sensor", DOMAIN, f"mr200_{consumer}")
+    coordinator.async_update_plan()
+    assert "lte_wan" in coordinator._raw
+    assert set(coordinator.plan["lte_intf"].attrs) == {"curRxSpeed", "curTxSpeed", "totalStatistics"}
+
+    for unique_id in ("mr200_lte_isp_name", "mr200_lte_current_rx_speed"):
+        entity_id = registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+        registry.async_update_entity(entity_id, disabled_by=er.RegistryEntryDisabler.USER)
+    coordinator.async_update_plan()
+
+    assert "lte_wan" not in coordinator.plan
+    assert "lte_wan" not in coordinator._raw
+    assert coordinator.fetched_at("lte_wan") is None
+    assert set(coordinator.plan["lte_intf"].attrs) == {"curTxSpeed", "totalStatistics"}
+
+async def test_state_event_sections_are_fetched_only_while_listened_for(hass, coordinator, fake_router):
+    registry = er.async_get(hass)
+    coordinator.async_register_consumer("device_tracker", "entry_client_tracker", "client_trackers")
+    registry.async_get_or_create(
+        "device_tracker", DOMAIN, "entry_client_tracker", disabled_by=er.RegistryEntryDisabler.USER
+    )
+    coordinator.async_update_plan()
+    assert "clients" not in coordinator.plan
+    assert "lte_link" not in coordinator.plan
+
+    events = []
+    hass.bus.async_listen(EVENT_CLIENT_JOINED, events.append)
+    await coordinator.async_refresh()
+    assert "clients" in coordinator.plan
+    assert "lte_link" not in coordinator.plan
+    assert coordinator.data.total_clients == 200
+
+    fake_router.state["LAN_HOST_ENTRY"].append(["201,0,0,0,0,0", {
+        "IPAddress": "192.168.1.250", "MACAddress": "AA:BB:CC:00:00:01", "hostName": "laptop",
+    }])
+    coordinator.async_refresh_sections("clients")
+    await wait_for_polls(hass)
+
+    assert [event.data["mac"] for event in events] == ["AA:BB:CC:00:00:01"]
@@ -0,0 +1,39 @@
+from custom_components.tplink_mr200.data import (
+    FIELD_NAMES,
+    MR200Data,
+    MR200DeviceInfo,
+    changed_fields,
+    snapshot_from_dict,
+    snapshot_to_dict,
+)
+
+def test_everything_changes_against_no_snapshot():
+    assert changed_fields(None, MR200Data()) == frozenset(FIELD_NAMES)
+
+def test_changed_fields_lists_only_differences():
+    old = MR200Data(lte_signal_level=50, device_info=MR200DeviceInfo(model="MR200"))
+    new = MR200Data(lte_signal_level=75, device_info=MR200DeviceInfo(model="MR200"), wifi_5ghz=True)
+    assert changed_fields(old, new) == {"lte_signal_level", "wifi_5ghz"}
+    assert changed_fields(new, new) == frozenset()
+
+def test_changed_device_info_is_one_field():
+    old = MR200Data(device_info=MR200DeviceInfo(sw_version="1.0"))
+    new = MR200Data(device_info=MR200DeviceInfo(sw_version="1.1"))
+    assert changed_fields(old, new) == {"device_info"}
+
+def test_snapshot_round_trip():
+    data = MR200Data(
+        device_info=MR200DeviceInfo(manufacturer="TP-Link", mac_address="AA:BB:CC:00:00:01"),
+        lte_signal_level=100,
+        lte_total_statistics=1234.5,
+        guest_2_4ghz=False,
+    )
+    assert snapshot_from_dict(snapshot_to_dict(data)) == data
+
+def test_snapshot_from_dict_ignores_unknown_and_missing_keys():
+    stored = {"lte_signal_level": 25, "removed_field": 1, "device_info": {"model": "MR200", "old_key": "x"}}
+    data = snapshot_from_dict(stored)
+    assert data == MR200Data(lte_signal_level=25, device_info=MR200DeviceInfo(model="MR200"))
+
+def test_snapshot_from_dict_without_device_info():
+    assert snapshot_from_dict({}) == MR200Data()
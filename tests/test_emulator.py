@@ -0,0 +1,76 @@
+import pytest
+
+from custom_components.tplink_mr200.mr200 import (
+    CREDENTIAL_CACHE,
+    LoginFailedException,
+    MR200Client,
+    RequestFailedException,
+)
+from custom_components.tplink_mr200.sections import CONSUMERS, build_plan
+from custom_components.tplink_mr200.session import MR200Session
+
+@pytest.fixture(autouse=True)
+def clear_credential_cache(fake_router):
+    CREDENTIAL_CACHE.invalidate(fake_router.host)
+
+async def test_login_and_read_full_plan(fake_router, http_session):
+    client = MR200Client(fake_router.host, http_session)
+    session = MR200Session(client, "admin", "admin")
+    plan = build_plan(CONSUMERS)
+
+    results = dict(zip(plan, await session.async_call(client.read_sections, list(plan.values()))))
+
+    assert client.logged_in
+    assert results["lte_link"]["connectStatus"] == "4"
+    assert results["device_info"]["modelName"] == "Archer MR200"
+    assert len(results["clients"]) == 200
+    assert set(results["clients"][0]) == {"idx", "stack", "IPAddress", "MACAddress", "hostName"}
+
+async def test_token_lookup_stops_before_the_page_ends(fake_router, http_session):
+    client = MR200Client(fake_router.host, http_session)
+    await client.login("admin", "admin")
+    assert client.bytes_received < 50_000
+
+async def test_wrong_password(fake_router, http_session):
+    client = MR200Client(fake_router.host, http_session)
+    with pytest.raises(LoginFailedException):
+        await client.login("admin", "wrong")
+
+async def test_session_expiry_logs_in_again(fake_router, http_session):
+    client = MR200Client(fake_router.host, http_session)
+    session = MR200Session(client, "admin", "admin")
+    acts = list(build_plan(["lte_signal_level"]).values())
+
+    await session.async_call(client.read_sections, acts)
+    fake_router.expire_sessions()
+    (link,) = await session.async_call(client.read_sections, acts)
+
+    assert link == {"signalStrength": "3"}
+    assert fake_router.logins == 2
+
+async def test_error_code(fake_router, http_session):
+    client = MR200Client(fake_router.host, http_session)
+    session = MR200Session(client, "admin", "admin")
+    await session.async_call(client.logout)
+    fake_router.fail_next(9003)
+    with pytest.raises(RequestFailedException) as err:
+        await session.async_call(client.read_sections, list(build_plan(["lte_signal_level"]).values()))
+    assert err.value.code == 9003
+
+async def test_send_sms_and_toggle_wifi(fake_router, http_session):
+    client = MR200Client(fake_router.host, http_session)
+    session = MR200Session(client, "admin", "admin")
+    await session.async_call(client.send_sms, "+100", "a=b")
+    await session.async_call(client.set_wifi_state, 2, False)
+
+    assert fake_router.sent_sms == [("+100", "a=b")]
+    assert fake_router.state["LAN_WLAN"][1][1]["enable"] == "0"
+
+async def test_non_idempotent_call_is_resent_only_after_a_refusal(fake_router, http_session):
+    client = MR200Client(fake_router.host, http_session)
+    session = MR200Session(client, "admin", "admin")
+    await session.async_call(client.read_sections, list(build_plan(["lte_signal_level"]).values()))
+    fake_router.expire_sessions()
+    await session.async_call(client.send_sms, "+100", "hi", retry=False)
+    assert fake_router.sent_sms == [("+100", "hi")]
+    assert fake_router.logins == 2
@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+from custom_components.tplink_mr200.data import MR200Data
+from custom_components.tplink_mr200.exporter import FAMILIES, MetricsExporter
+from custom_components.tplink_mr200.metrics import ClientMetrics
+
+class FakeUsage:
+    rolling = 3000.0
+
+    def period(self, name):
+        return {"today": 1000.0, "billing_cycle": 2000.0}[name]
+
+def coordinator(entry_id, host, data, durations=()):
+    metrics = ClientMetrics()
+    for duration in durations:
+        metrics.observe("poll", duration)
+    return SimpleNamespace(
+        entry=SimpleNamespace(entry_id=entry_id, data={"host": host}),
+        data=data,
+        session=SimpleNamespace(client=SimpleNamespace(metrics=metrics)),
+        health=SimpleNamespace(online=True),
+        last_update_success=True,
+        usage=FakeUsage(),
+        sms_inbox=SimpleNamespace(total=12),
+    )
+
+def render(*coordinators):
+    exporter = MetricsExporter()
+    for item in coordinators:
+        exporter.async_update(item)
+    return exporter, exporter.body.decode("utf-8").splitlines()
+
+def test_exposition_structure():
+    _, lines = render(
+        coordinator("a", "192.168.1.1", MR200Data(lte_signal_level=75)),
+        coordinator("b", "192.168.2.1", MR200Data(lte_signal_level=50)),
+    )
+    assert lines[-1] == "# EOF"
+    assert lines.count("# EOF") == 1
+    for name, metric_type, _ in FAMILIES:
+        type_line = lines.index(f"# TYPE tplink_mr200_{name} {metric_type}")
+        assert lines[type_line + 1].startswith(f"# HELP tplink_mr200_{name} ")
+    assert 'tplink_mr200_lte_signal_level{host="192.168.1.1"} 75' in lines
+    assert 'tplink_mr200_lte_signal_level{host="192.168.2.1"} 50' in lines
+    assert 'tplink_mr200_lte_usage_bytes{host="192.168.1.1",period="billing_cycle"} 2000.0' in lines
+
+def test_histogram_buckets_are_cumulative():
+    _, lines = render(coordinator("a", "192.168.1.1", MR200Data(), durations=(0.01, 0.2, 0.2, 30)))
+    buckets = [line for line in lines if line.startswith("tplink_mr200_poll_duration_seconds_bucket")]
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert buckets[0] == 'tplink_mr200_poll_duration_seconds_bucket{host="192.168.1.1",le="0.05"} 1'
+    assert buckets[-1] == 'tplink_mr200_poll_duration_seconds_bucket{host="192.168.1.1",le="+Inf"} 4'
+    assert 'tplink_mr200_poll_duration_seconds_count{host="192.168.1.1"} 4' in lines
+
+def test_label_values_are_escaped():
+    _, lines = render(coordinator("a", 'my "router"\\\n', MR200Data(lte_signal_level=75)))
+    assert 'tplink_mr200_lte_signal_level{host="my \\"router\\"\\\\\\n"} 75' in lines
+
+def test_missing_fields_produce_no_sample():
+    _, lines = render(coordinator("a", "192.168.1.1", MR200Data(lte_signal_level=None, unread_sms=3)))
+    assert not any(line.startswith("tplink_mr200_lte_signal_level{") for line in lines)
+    assert not any(line.startswith("tplink_mr200_lte_traffic_bytes_total{") for line in lines)
+    assert 'tplink_mr200_sms_unread{host="192.168.1.1"} 3' in lines
+
+def test_remove_drops_the_routers_lines():
+    exporter, _ = render(
+        coordinator("a", "192.168.1.1", MR200Data(lte_signal_level=75)),
+        coordinator("b", "192.168.2.1", MR200Data(lte_signal_level=50)),
+    )
+    exporter.async_remove("a")
+    lines = exporter.body.decode("utf-8").splitlines()
+    assert not any('host="192.168.1.1"' in line for line in lines)
+    assert 'tplink_mr200_lte_signal_level{host="192.168.2.1"} 50' in lines
+    assert lines[-1] == "# EOF"
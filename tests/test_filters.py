@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.tplink_mr200 import sensor
+from custom_components.tplink_mr200.data import MR200Data
+from custom_components.tplink_mr200.filters import SensorFilter, sensor_filter
+from custom_components.tplink_mr200.sensor import SENSORS, Sensor
+
+RX_SPEED = next(description for description in SENSORS if description.key == "lte_current_rx_speed")
+
+@pytest.fixture(autouse=True)
+def sensor_clock(monkeypatch, clock):
+    monkeypatch.setattr(sensor, "monotonic", clock)
+
+def coordinator(rx_speed):
+    return SimpleNamespace(
+        device=SimpleNamespace(slug="mr200"),
+        data=MR200Data(lte_current_rx_speed=rx_speed),
+        changed=frozenset({"lte_current_rx_speed"}),
+        last_update_success=True,
+        async_register_consumer=lambda domain, unique_id, consumer: None,
+    )
+
+def filtered_sensor(coordinator, value_filter):
+    entity = Sensor(coordinator, RX_SPEED, value_filter)
+    entity.writes = []
+    entity.async_write_ha_state = lambda: entity.writes.append(entity.native_value)
+    return entity
+
+def poll(entity, rx_speed):
+    entity.coordinator.data = MR200Data(lte_current_rx_speed=rx_speed)
+    entity._handle_coordinator_update()
+
+def test_relative_deadband_from_zero_accepts_any_change():
+    value_filter = SensorFilter(deadband=10, relative=True)
+    assert value_filter.accept(0, 1, 0)
+    assert not value_filter.accept(0, 0, 0)
+
+def test_absolute_and_relative_deadband():
+    assert not SensorFilter(deadband=100).accept(1000, 1100, 0)
+    assert SensorFilter(deadband=100).accept(1000, 1101, 0)
+    assert not SensorFilter(deadband=10, relative=True).accept(1000, 900, 0)
+    assert SensorFilter(deadband=10, relative=True).accept(1000, 899, 0)
+
+def test_unknown_values_always_pass():
+    value_filter = SensorFilter(deadband=100, min_interval=60)
+    assert value_filter.accept(None, 5, 0)
+    assert value_filter.accept(5, None, 0)
+
+def test_max_age_overrides_deadband_and_min_interval():
+    value_filter = SensorFilter(deadband=100, min_interval=600, max_age=300)
+    assert not value_filter.accept(1000, 1001, 299)
+    assert value_filter.accept(1000, 1001, 300)
+
+def test_sensor_filter_is_off_without_options():
+    assert sensor_filter({}, "lte_current_rx_speed") is None
+    value_filter = sensor_filter({"lte_current_rx_speed_deadband": 5, "lte_current_rx_speed_deadband_relative": True}, "lte_current_rx_speed")
+    assert (value_filter.deadband, value_filter.relative) == (5, True)
+
+def test_sensor_holds_writes_until_min_interval_expires(clock):
+    entity = filtered_sensor(coordinator(1000), SensorFilter(min_interval=60))
+    poll(entity, 1000)
+    assert entity.writes == [1000]
+
+    clock.now += 30
+    poll(entity, 5000)
+    assert entity.writes == [1000]
+    assert entity.native_value == 1000
+
+    clock.now += 30
+    poll(entity, 5000)
+    assert entity.writes == [1000, 5000]
+
+def test_sensor_rewrites_inside_deadband_after_max_age(clock):
+    entity = filtered_sensor(coordinator(1000), SensorFilter(deadband=100, max_age=300))
+    poll(entity, 1000)
+
+    clock.now += 299
+    poll(entity, 1050)
+    assert entity.writes == [1000]
+
+    clock.now += 1
+    poll(entity, 1050)
+    assert entity.writes == [1000, 1050]
+
+def test_sensor_writes_when_value_becomes_unknown(clock):
+    entity = filtered_sensor(coordinator(1000), SensorFilter(deadband=100, min_interval=60))
+    poll(entity, 1000)
+    poll(entity, None)
+    assert entity.writes == [1000, None]
@@ -0,0 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.tplink_mr200 import fleet
+from custom_components.tplink_mr200.const import EVENT_SMS_RECEIVED
+from custom_components.tplink_mr200.coordinator import MR200Coordinator
+from custom_components.tplink_mr200.fleet import FleetScheduler
+from custom_components.tplink_mr200.mr200 import MR200Client
+from custom_components.tplink_mr200.session import MR200Session
+
+class BlockingCoordinator:
+    def __init__(self):
+        self.entry = SimpleNamespace(entry_id="entry", title="MR200")
+        self.tick = 10
+        self.refreshes = 0
+        self.release = asyncio.Event()
+
+    async def async_refresh(self):
+        self.refreshes += 1
+        await self.release.wait()
+        self.release.clear()
+
+@pytest.fixture
+def timers(monkeypatch):
+    timers = []
+    monkeypatch.setattr(fleet, "async_call_later", lambda hass, delay, action: timers.append(action) or (lambda: None))
+    monkeypatch.setattr(fleet, "async_track_time_interval", lambda hass, action, interval: timers.append(action) or (lambda: None))
+    return timers
+
+async def test_tick_is_skipped_while_a_poll_is_running(hass, timers):
+    scheduler = FleetScheduler(hass)
+    coordinator = BlockingCoordinator()
+    unregister = scheduler.async_register(coordinator)
+
+    timers[0](None)
+    await asyncio.sleep(0)
+    tick = timers[1]
+    tick()
+    await asyncio.sleep(0)
+    assert coordinator.refreshes == 1
+
+    coordinator.release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    tick()
+    await asyncio.sleep(0)
+    assert coordinator.refreshes == 2
+    unregister()
+
+async def test_requests_during_a_poll_run_one_follow_up_poll(hass):
+    scheduler = FleetScheduler(hass)
+    coordinator = BlockingCoordinator()
+
+    scheduler.async_request_poll(coordinator)
+    await asyncio.sleep(0)
+    scheduler.async_request_poll(coordinator)
+    scheduler.async_request_poll(coordinator)
+    coordinator.release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert coordinator.refreshes == 2
+
+    coordinator.release.set()
+    await hass.async_block_till_done()
+    assert coordinator.refreshes == 2
+    assert scheduler._in_flight == {}
+
+async def test_unregister_cancels_the_running_poll(hass, timers):
+    scheduler = FleetScheduler(hass)
+    coordinator = BlockingCoordinator()
+    unregister = scheduler.async_register(coordinator)
+
+    scheduler.async_request_poll(coordinator)
+    await asyncio.sleep(0)
+    task = scheduler._in_flight["entry"]
+    unregister()
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    assert scheduler._in_flight == {}
+
+async def test_overlapping_refreshes_fire_one_event(hass, fake_router, http_session):
+    entry = SimpleNamespace(entry_id="entry", title="MR200", data={"host": fake_router.host}, options={})
+    session = MR200Session(MR200Client(fake_router.host, http_session), "admin", "admin")
+    coordinator = MR200Coordinator(hass, entry, session)
+    await coordinator.async_refresh()
+
+    events = []
+    hass.bus.async_listen(EVENT_SMS_RECEIVED, events.append)
+    fake_router.receive_sms("+100", "hello", "2026-02-01 08:00:00")
+    coordinator._fetched_at.pop("sms")
+    await asyncio.gather(coordinator.async_refresh(), coordinator.async_refresh())
+    await hass.async_block_till_done()
+
+    assert [event.data["index"] for event in events] == ["101"]
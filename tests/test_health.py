@@ -0,0 +1,103 @@
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.tplink_mr200 import health
+from custom_components.tplink_mr200.button import REBOOT, RebootButton
+from custom_components.tplink_mr200.health import (
+    BACKOFF_MIN,
+    REBOOT_PROBE_INTERVAL,
+    RouterHealth,
+    STATE_OFFLINE,
+    STATE_ONLINE,
+    STATE_REBOOTING,
+)
+from custom_components.tplink_mr200.mr200 import NotLoggedInException, RequestRejectedException
+from custom_components.tplink_mr200.session import MR200Session
+
+class FakeClient:
+    router_ip = "192.168.1.1"
+    reachable = False
+
+    async def probe(self):
+        return self.reachable
+
+@pytest.fixture
+def scheduled(monkeypatch):
+    calls = []
+    monkeypatch.setattr(health, "async_call_later", lambda hass, delay, action: calls.append(delay) or (lambda: None))
+    return calls
+
+async def _recovered():
+    pass
+
+def test_login_failures_back_off_without_tripping_the_breaker(scheduled):
+    router = RouterHealth(None, FakeClient(), _recovered)
+    router.async_record_login_failure()
+    router.async_record_login_failure()
+
+    assert router.online
+    assert router.login_blocked
+    assert not router.available
+    assert router._login_backoff == 2 * BACKOFF_MIN
+    assert scheduled == []
+
+    router.async_record_success()
+    assert router.available
+
+async def test_reboot_probing_falls_back_to_offline_backoff(scheduled, clock):
+    router = RouterHealth(None, FakeClient(), _recovered, clock)
+    router.async_mark_rebooting()
+    await router._async_probe(None)
+    assert router.state == STATE_REBOOTING
+    assert scheduled[-1] == REBOOT_PROBE_INTERVAL
+
+    clock.now = router._reboot_deadline + 1
+    await router._async_probe(None)
+    assert router.state == STATE_OFFLINE
+    assert scheduled[-1] == BACKOFF_MIN
+
+    await router._async_probe(None)
+    assert scheduled[-1] == 2 * BACKOFF_MIN
+
+def test_backoff_survives_a_probe_that_recovers_too_early(scheduled):
+    router = RouterHealth(None, FakeClient(), _recovered)
+    router._backoff = 4 * BACKOFF_MIN
+    router.async_record_failure()
+    router.async_record_failure()
+    assert router.state == STATE_OFFLINE
+    assert scheduled[-1] == 4 * BACKOFF_MIN
+
+class RebootingClient:
+    router_ip = "192.168.1.1"
+    logged_in = True
+
+    def __init__(self, error):
+        self.error = error
+        self.reboots = 0
+
+    async def reboot(self):
+        self.reboots += 1
+        raise self.error
+
+    async def login(self, username, password):
+        pass
+
+@pytest.mark.parametrize("error, state, reboots, raises", [
+    (aiohttp.ServerDisconnectedError(), STATE_REBOOTING, 1, nullcontext()),
+    (TimeoutError(), STATE_REBOOTING, 1, nullcontext()),
+    (NotLoggedInException(), STATE_REBOOTING, 1, nullcontext()),
+    (RequestRejectedException(), STATE_ONLINE, 2, pytest.raises(HomeAssistantError)),
+])
+async def test_reboot_button_marks_rebooting_when_the_connection_drops(scheduled, error, state, reboots, raises):
+    client = RebootingClient(error)
+    router = RouterHealth(None, client, _recovered)
+    coordinator = SimpleNamespace(device=SimpleNamespace(slug="mr200"), health=router)
+
+    with raises:
+        await RebootButton(coordinator, MR200Session(client, "admin", "admin"), REBOOT).async_press()
+    assert router.state == state
+    assert client.reboots == reboots
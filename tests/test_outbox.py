@@ -0,0 +1,75 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.tplink_mr200.mr200 import ConnectionFailedException, NotLoggedInException
+from custom_components.tplink_mr200.outbox import SmsOutbox
+from custom_components.tplink_mr200.session import MR200Session
+
+class FakeClient:
+    router_ip = "192.168.1.1"
+    logged_in = True
+
+    def __init__(self, failures=0, error=ConnectionFailedException):
+        self.failures = failures
+        self.error = error
+        self.attempts = 0
+        self.sent = []
+
+    async def send_sms(self, number, text):
+        self.attempts += 1
+        if self.failures:
+            self.failures -= 1
+            raise self.error()
+        self.sent.append(number)
+
+    async def login(self, username, password):
+        pass
+
+    async def read(self):
+        return "ok"
+
+@pytest.fixture
+def hass():
+    return SimpleNamespace(async_create_background_task=lambda coro, name: asyncio.create_task(coro))
+
+async def test_polls_are_not_blocked_by_rate_limit_or_backoff(hass):
+    client = FakeClient(failures=1)
+    session = MR200Session(client, "admin", "admin")
+    outbox = SmsOutbox(hass, session, 0.1, 2)
+    outbox.async_start()
+
+    send = asyncio.create_task(outbox.async_send(["1", "2", "3"], "hi"))
+    await asyncio.sleep(0.02)
+    start = time.monotonic()
+    assert await session.async_call(client.read) == "ok"
+    assert time.monotonic() - start < 0.05
+
+    await send
+    assert client.sent == ["1", "2", "3"]
+    outbox.async_stop()
+
+async def test_stop_resolves_in_flight_sends(hass):
+    client = FakeClient(failures=10)
+    outbox = SmsOutbox(hass, MR200Session(client, "admin", "admin"), 10, 2)
+    outbox.async_start()
+
+    send = asyncio.create_task(outbox.async_send(["1", "2"], "hi"))
+    await asyncio.sleep(0.02)
+    outbox.async_stop()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(send, 1)
+
+@pytest.mark.parametrize("error", [TimeoutError, NotLoggedInException])
+async def test_sends_that_may_have_reached_the_router_are_not_retried(hass, error):
+    client = FakeClient(failures=1, error=error)
+    outbox = SmsOutbox(hass, MR200Session(client, "admin", "admin"), 0, 2)
+    outbox.async_start()
+
+    with pytest.raises(error):
+        await outbox.async_send(["1"], "hi")
+    assert client.attempts == 1
+    outbox.async_stop()
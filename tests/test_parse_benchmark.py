@@ -0,0 +1,33 @@
+import tracemalloc
+
+import pytest
+
+from custom_components.tplink_mr200.mr200 import Act, ACT_GL, parse_response
+
+from .conftest import load_fixture
+from .test_parse_response import LTE_ACTS, SMS_ACTS
+
+@pytest.mark.parametrize("name, acts", [
+    ("lte_status.txt", LTE_ACTS),
+    ("lan_host_entry.txt", [Act(ACT_GL, "LAN_HOST_ENTRY")]),
+    ("sms_inbox.txt", SMS_ACTS),
+])
+def test_parse_response_benchmark(benchmark, name, acts):
+    data = load_fixture(name)
+    response = benchmark(parse_response, data, acts)
+    assert response.error == 0
+
+    tracemalloc.start()
+    try:
+        parsed = parse_response(data, acts)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    stats = snapshot.statistics("filename")
+    benchmark.extra_info.update({
+        "allocations": sum(stat.count for stat in stats),
+        "allocated_bytes": sum(stat.size for stat in stats),
+        "peak_bytes": peak,
+    })
+    assert parsed.error == 0
@@ -0,0 +1,57 @@
+from custom_components.tplink_mr200.mr200 import Act, ACT_GET, ACT_SET, ACT_GL, parse_response
+
+from .conftest import load_fixture
+
+LTE_ACTS = [
+    Act(ACT_GET, "WAN_LTE_LINK_CFG", "2,1,0,0,0,0"),
+    Act(ACT_GET, "WAN_LTE_INTF_CFG", "2,0,0,0,0,0"),
+    Act(ACT_GET, "LTE_WAN_CFG", "2,1,0,0,0,0"),
+    Act(ACT_GET, "LTE_SMS_RECVMSGBOX"),
+]
+
+SMS_ACTS = [
+    Act(ACT_SET, "LTE_SMS_RECVMSGBOX", attrs=("PageNumber=1",)),
+    Act(ACT_GL, "LTE_SMS_RECVMSGENTRY"),
+]
+
+def test_splits_sections_by_index():
+    response = parse_response(load_fixture("lte_status.txt"), LTE_ACTS)
+    link, intf, wan, sms = response.sections
+    assert link["connectStatus"] == "4"
+    assert link["signalStrength"] == "3"
+    assert intf == {"curRxSpeed": "125430", "curTxSpeed": "20411", "totalStatistics": "9876543210"}
+    assert wan == {"profileName": "giffgaff"}
+    assert sms == {"totalNumber": "42"}
+    assert response.error == 0
+
+def test_gl_records_keep_index_and_stack():
+    response = parse_response(load_fixture("lan_host_entry.txt"), [Act(ACT_GL, "LAN_HOST_ENTRY")])
+    (hosts,) = response.sections
+    assert len(hosts) == 200
+    assert hosts[0]["idx"] == 1
+    assert hosts[0]["stack"] == "1,0,0,0,0,0"
+    assert hosts[-1]["idx"] == 200
+    assert hosts[-1]["IPAddress"] == "192.168.1.201"
+
+def test_keeps_equals_signs_inside_values():
+    response = parse_response(load_fixture("sms_inbox.txt"), SMS_ACTS)
+    box, messages = response.sections
+    assert box == {}
+    assert len(messages) == 100
+    assert messages[0]["content"].endswith("?ref=1&src=sms")
+    assert "=" in messages[0]["content"]
+
+def test_error_footer():
+    response = parse_response(b"[error]71233\n", [Act(ACT_GET, "IGD_DEV_INFO")])
+    assert response.sections == [{}]
+    assert response.error == 71233
+
+def test_missing_footer_leaves_error_unset():
+    response = parse_response(b"[0,0,0,0,0,0]0\nmodelName=MR200\n", [Act(ACT_GET, "IGD_DEV_INFO")])
+    assert response.sections == [{"modelName": "MR200"}]
+    assert response.error is None
+
+def test_ignores_sections_beyond_the_request():
+    data = b"[0,0,0,0,0,0]0\nmodelName=MR200\n[0,0,0,0,0,0]5\nstray=1\n[error]0\n"
+    response = parse_response(data, [Act(ACT_GET, "IGD_DEV_INFO")])
+    assert response.sections == [{"modelName": "MR200"}]
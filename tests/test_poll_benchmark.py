@@ -0,0 +1,60 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp.test_utils import TestServer
+
+from custom_components.tplink_mr200.mr200 import CREDENTIAL_CACHE, MR200Client
+from custom_components.tplink_mr200.sections import CONSUMERS, build_plan
+from custom_components.tplink_mr200.session import MR200Session
+
+from .emulator import FakeMR200
+
+ACTS = list(build_plan(CONSUMERS).values())
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.mark.parametrize("latency", [0.0, 0.02])
+@pytest.mark.parametrize("cold", [False, True], ids=["warm", "cold"])
+def test_poll_benchmark(benchmark, loop, latency, cold):
+    router = FakeMR200(latency=latency)
+    server = TestServer(router.app)
+    loop.run_until_complete(server.start_server())
+    http_session = loop.run_until_complete(_create_session())
+    client = MR200Client(f"{server.host}:{server.port}", http_session)
+    session = MR200Session(client, "admin", "admin")
+    rounds = []
+
+    async def poll():
+        if cold:
+            router.expire_sessions()
+            client.headers.pop("TokenID", None)
+            CREDENTIAL_CACHE.invalidate(client.router_ip)
+        before = (client.request_count, client.bytes_sent, client.bytes_received)
+        results = await session.async_call(client.read_sections, ACTS)
+        rounds.append((
+            client.request_count - before[0],
+            client.bytes_sent - before[1],
+            client.bytes_received - before[2],
+        ))
+        return results
+
+    try:
+        loop.run_until_complete(poll())
+        rounds.clear()
+        results = benchmark.pedantic(lambda: loop.run_until_complete(poll()), rounds=20, warmup_rounds=1)
+    finally:
+        loop.run_until_complete(http_session.close())
+        loop.run_until_complete(server.close())
+
+    requests, sent, received = rounds[-1]
+    benchmark.extra_info.update({"requests": requests, "bytes_sent": sent, "bytes_received": received})
+    assert len(results) == len(ACTS)
+    assert requests == (4 if cold else 1)
+
+async def _create_session():
+    return aiohttp.ClientSession()
@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.tplink_mr200.const import EVENT_SMS_RECEIVED
+from custom_components.tplink_mr200.mr200 import MR200Client, RequestFailedException
+from custom_components.tplink_mr200.session import MR200Session
+from custom_components.tplink_mr200.sms import SmsInbox
+
+class FakeBus:
+    def __init__(self):
+        self.events = []
+
+    def async_fire(self, event_type, data):
+        self.events.append((event_type, data))
+
+@pytest.fixture
+def inbox():
+    return SmsInbox(SimpleNamespace(bus=FakeBus()), "entry", "192.168.1.1")
+
+@pytest.fixture
+def session(fake_router, http_session):
+    return MR200Session(MR200Client(fake_router.host, http_session), "admin", "admin")
+
+def total(router):
+    return int(router.state["LTE_SMS_RECVMSGBOX"][0][1]["totalNumber"])
+
+def received(inbox):
+    return [(event, data["index"], data["content"]) for event, data in inbox._hass.bus.events]
+
+async def test_first_sync_takes_high_water_mark_from_last_page(fake_router, session, inbox):
+    await inbox.async_sync(session, total(fake_router))
+    assert inbox.total == 100
+    assert inbox.high_water_mark == ("2026-01-09 07:21:42", 100)
+    assert inbox._hass.bus.events == []
+    assert fake_router.requests == 1 + 3
+
+async def test_new_message_on_last_page(fake_router, session, inbox):
+    await inbox.async_sync(session, total(fake_router))
+
+    fake_router.receive_sms("+100", "hello", "2026-02-01 08:00:00")
+    await inbox.async_sync(session, total(fake_router))
+
+    assert inbox.total == 101
+    assert received(inbox) == [(EVENT_SMS_RECEIVED, "101", "hello")]
+
+async def test_new_messages_spanning_pages_stop_at_a_page_without_news(fake_router, session, inbox):
+    await inbox.async_sync(session, total(fake_router))
+
+    for i in range(10):
+        fake_router.receive_sms("+100", f"hello {i}", f"2026-02-01 08:00:{i:02}")
+    requests = fake_router.requests
+    await inbox.async_sync(session, total(fake_router))
+
+    assert inbox.total == 110
+    assert [index for _, index, _ in received(inbox)] == [str(index) for index in range(101, 111)]
+    # Pages 14, 13 and 12 are listed, and bodies are fetched from 14 and 13
+    assert fake_router.requests - requests == 5
+
+async def test_unchanged_inbox_uses_the_polled_listing(fake_router, session, inbox):
+    await inbox.async_sync(session, total(fake_router))
+
+    page = inbox.listing_page
+    _, entries = await session.async_call(session.client.read_sections, inbox.listing_acts())
+    requests = fake_router.requests
+    await inbox.async_sync(session, total(fake_router), (page, entries))
+
+    assert fake_router.requests == requests
+    assert inbox._hass.bus.events == []
+
+async def test_restored_mark_reports_messages_received_while_stopped(fake_router, session, inbox):
+    await inbox.async_sync(session, total(fake_router))
+    stored = inbox.as_dict()
+
+    fake_router.receive_sms("+100", "hello", "2026-02-01 08:00:00")
+    restarted = SmsInbox(SimpleNamespace(bus=FakeBus()), "entry", "192.168.1.1")
+    restarted.restore({**stored, "high_water_mark": list(stored["high_water_mark"])})
+    await restarted.async_sync(session, total(fake_router))
+
+    assert received(restarted) == [(EVENT_SMS_RECEIVED, "101", "hello")]
+
+async def test_message_received_alongside_a_deletion(fake_router, session, inbox):
+    await inbox.async_sync(session, total(fake_router))
+
+    fake_router.delete_sms(3)
+    fake_router.receive_sms("+100", "hello", "2026-02-01 08:00:00")
+    await inbox.async_sync(session, total(fake_router))
+
+    assert inbox.total == 100
+    assert received(inbox) == [(EVENT_SMS_RECEIVED, "101", "hello")]
+
+async def test_deletion_alone_fires_nothing(fake_router, session, inbox):
+    await inbox.async_sync(session, total(fake_router))
+
+    fake_router.delete_sms(3)
+    await inbox.async_sync(session, total(fake_router))
+
+    assert inbox.total == 99
+    assert inbox._hass.bus.events == []
+
+async def test_failed_sync_is_retried_on_next_poll(fake_router, session, inbox):
+    await inbox.async_sync(session, total(fake_router))
+
+    fake_router.receive_sms("+100", "hello", "2026-02-01 08:00:00")
+    fake_router.fail_next(9003)
+    with pytest.raises(RequestFailedException):
+        await inbox.async_sync(session, total(fake_router))
+    assert inbox.total == 100
+    assert inbox._hass.bus.events == []
+
+    await inbox.async_sync(session, total(fake_router))
+    assert inbox.total == 101
+    assert received(inbox) == [(EVENT_SMS_RECEIVED, "101", "hello")]
@@ -0,0 +1,24 @@
+from custom_components.tplink_mr200.throughput import RingBuffer, window_stats
+
+def test_since_returns_newest_first_and_stops_at_the_cutoff():
+    buffer = RingBuffer(8)
+    for second in range(5):
+        buffer.append(100.0 + second, second * 10)
+    assert buffer.since(102.0) == [40, 30, 20]
+    assert buffer.since(200.0) == []
+
+def test_since_skips_overwritten_samples():
+    buffer = RingBuffer(3)
+    for second in range(5):
+        buffer.append(100.0 + second, second)
+    assert buffer.since(0.0) == [4, 3, 2]
+
+def test_empty_buffer_has_no_samples():
+    assert RingBuffer(4).since(0.0) == []
+
+def test_window_stats():
+    assert window_stats(list(range(1, 21))) == {"min": 1, "max": 20, "mean": 10.5, "p95": 19}
+    assert window_stats([7]) == {"min": 7, "max": 7, "mean": 7.0, "p95": 7}
+
+def test_window_stats_without_samples():
+    assert window_stats([]) is None
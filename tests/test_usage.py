@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.tplink_mr200 import usage
+from custom_components.tplink_mr200.usage import UsageCounter, billing_cycle_start
+
+class FakeStore:
+    def async_delay_save(self, data_func, delay):
+        pass
+
+@pytest.fixture(autouse=True)
+def usage_clock(monkeypatch, clock):
+    clock.now = datetime(2025, 10, 14, 23, 30, tzinfo=timezone.utc)
+    monkeypatch.setattr(usage, "dt_now", clock)
+
+@pytest.fixture
+def counter(clock):
+    counter = UsageCounter(None, "entry", billing_day=15)
+    counter._store = FakeStore()
+    counter._recompute(clock.now)
+    return counter
+
+def test_missing_reading_is_not_a_reboot(counter):
+    for total in (1000.0, 1600.0, None, 1700.0):
+        counter.async_add_total(total)
+    assert counter.period("today") == 700
+
+def test_counter_reset_counts_from_zero(counter):
+    for total in (1000.0, 1600.0, 100.0):
+        counter.async_add_total(total)
+    assert counter.period("today") == 700
+    assert counter.rolling == 700
+
+def test_periods_roll_over_without_new_samples(counter, clock):
+    counter.async_add_total(1000.0)
+    counter.async_add_total(1500.0)
+    assert counter.period("today") == 500
+    assert counter.period("billing_cycle") == 500
+
+    clock.now = datetime(2025, 10, 15, 0, 30, tzinfo=timezone.utc)
+    assert counter.period("today") == 0
+    assert counter.period("billing_cycle") == 0
+    assert counter.period_start("today") == datetime(2025, 10, 15, tzinfo=timezone.utc)
+    assert counter.rolling == 500
+
+def test_restart_keeps_usage_after_a_half_hour_offset_midnight(counter, clock):
+    india = timezone(timedelta(hours=5, minutes=30))
+    clock.now = datetime(2025, 10, 15, 0, 5, tzinfo=india)
+    counter.async_add_total(1000.0)
+    clock.now = datetime(2025, 10, 15, 0, 10, tzinfo=india)
+    counter.async_add_total(1500.0)
+    assert counter.period("today") == 500
+
+    counter._recompute(clock.now)
+    assert counter.period("today") == 500
+    assert counter.period("billing_cycle") == 500
+
+def test_billing_cycle_start_clamps_to_month_length():
+    now = datetime(2025, 2, 28, 12, tzinfo=timezone.utc)
+    assert billing_cycle_start(now, 31) == datetime(2025, 2, 28, tzinfo=timezone.utc)
+    assert billing_cycle_start(now.replace(day=27), 31) == datetime(2025, 1, 31, tzinfo=timezone.utc)
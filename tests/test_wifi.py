@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+
+from custom_components.tplink_mr200.coordinator import MR200Coordinator
+from custom_components.tplink_mr200.mr200 import MR200Client
+from custom_components.tplink_mr200.session import MR200Session
+from custom_components.tplink_mr200.wifi import WIFI_NETWORKS, WRITE_DELAY, WifiWriter
+
+from .conftest import wait_for_polls
+
+async def test_toggles_within_write_delay_share_one_write_and_read_back(hass, fake_router, http_session):
+    entry = SimpleNamespace(entry_id="entry", title="MR200", data={"host": fake_router.host}, options={})
+    session = MR200Session(MR200Client(fake_router.host, http_session), "admin", "admin")
+    coordinator = MR200Coordinator(hass, entry, session)
+    await coordinator.async_refresh()
+    writer = WifiWriter(hass, coordinator)
+    requests = fake_router.requests
+
+    writer.async_set("wifi_2_4ghz", False)
+    writer.async_set("wifi_5ghz", False)
+    writer.async_set("guest_2_4ghz", True)
+    writer.async_set("guest_5ghz", True)
+    assert writer.state("wifi_5ghz") is False
+    await asyncio.sleep(WRITE_DELAY * 2)
+    await wait_for_polls(hass)
+
+    assert fake_router.requests - requests == 2
+    assert [values["enable"] for _, values in fake_router.state["LAN_WLAN"]] == ["0", "0"]
+    assert [values["enable"] for _, values in fake_router.state["LAN_WLAN_MSSIDENTRY"]] == ["1", "1"]
+    assert (coordinator.data.wifi_2_4ghz, coordinator.data.wifi_5ghz) == (False, False)
+    assert (coordinator.data.guest_2_4ghz, coordinator.data.guest_5ghz) == (True, True)
+    assert [writer.state(key) for key in WIFI_NETWORKS] == [None] * 4
+    assert writer.optimistic == {}
+
+async def test_written_state_is_held_until_the_read_back(hass, fake_router, http_session):
+    entry = SimpleNamespace(entry_id="entry", title="MR200", data={"host": fake_router.host}, options={})
+    session = MR200Session(MR200Client(fake_router.host, http_session), "admin", "admin")
+    coordinator = MR200Coordinator(hass, entry, session)
+    await coordinator.async_refresh()
+    writer = WifiWriter(hass, coordinator)
+    coordinator.async_refresh_sections = lambda *names: None
+
+    writer.async_set("wifi_5ghz", False)
+    await asyncio.sleep(WRITE_DELAY * 2)
+    await hass.async_block_till_done()
+
+    assert coordinator.data.wifi_5ghz is True
+    assert writer.state("wifi_5ghz") is False